@@ -0,0 +1,65 @@
+"""Compare the time and peak memory of decoding a large device listing
+the way Wink._http used to (bytes to str, then json.loads) with the codec
+used now (wink.codec.default_codec, which picks orjson if installed).
+
+Run it from the benchmarks directory: python decode.py [devices]
+"""
+
+if __name__ == "__main__":
+    import json
+    import sys
+    import timeit
+    import tracemalloc
+    try:
+        import wink
+    except ImportError as e:
+        sys.path.insert(0, "..")
+        import wink
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    listing = dict(data=[
+        dict(
+            object_type="light_bulb",
+            light_bulb_id=str(i),
+            name="bulb %d" % i,
+            desired_state=dict(powered=True, brightness=0.5),
+            last_reading=dict(
+                connection=True,
+                connection_updated_at=1400000000.0,
+                powered=True,
+                powered_updated_at=1400000000.0,
+                brightness=0.5,
+                brightness_updated_at=1400000000.0,
+            ),
+            capabilities=dict(fields=[
+                dict(field="powered", type="boolean", mutability="read-write"),
+                dict(field="brightness", type="percentage",
+                     mutability="read-write"),
+            ]),
+        )
+        for i in range(count)
+    ])
+    body = json.dumps(listing).encode("utf-8")
+
+    codecs = [
+        ("str + json.loads (old)", lambda: json.loads(body.decode("utf-8"))),
+        ("wink.codec.JSONCodec", lambda: wink.codec.JSONCodec().decode(body)),
+    ]
+    if wink.codec.orjson is not None:
+        codecs.append(
+            ("wink.codec.OrjsonCodec",
+             lambda: wink.codec.OrjsonCodec().decode(body)))
+
+    print("%d devices, %.1f MB body" % (count, len(body) / 1e6))
+
+    for name, decode in codecs:
+        seconds = min(timeit.repeat(decode, number=5, repeat=3)) / 5
+
+        tracemalloc.start()
+        decode()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print("%-26s %8.2f ms %8.1f MB peak" % (
+            name, seconds * 1e3, peak / 1e6))
@@ -0,0 +1,55 @@
+"""Measure the per-request overhead of Wink._http with the network
+stubbed out, i.e. everything the library does around the actual request:
+the token check, building the headers and decoding the response, and
+the cost of tracing it (see wink.trace).
+
+Run it from the benchmarks directory: python http_overhead.py
+"""
+
+if __name__ == "__main__":
+    import timeit
+    try:
+        import wink
+    except ImportError as e:
+        import sys
+        sys.path.insert(0, "..")
+        import wink
+
+    class StubTransport(wink.transport.Transport):
+        response = b'{"data": {"light_bulb_id": "1", "name": "bulb"}}'
+
+        def request(self, url, method="GET", headers=None, body=None):
+            return {"status": "200"}, self.response
+
+    w = wink.Wink(
+        dict(
+            base_url="https://winkapi.quirky.com",
+            client_id="client",
+            client_secret="secret",
+            access_token="access",
+            refresh_token="refresh",
+            expires="2100-01-01 00:00:00",
+        ),
+        save_auth=False,
+        populate=False,
+        transport=StubTransport(),
+    )
+
+    traced = wink.Wink(
+        dict(w.auth),
+        save_auth=False,
+        populate=False,
+        transport=StubTransport(),
+        tracer=wink.trace.Tracer(),
+    )
+
+    number = 100000
+
+    for name, stmt in [
+        ("token check (parsed expiry)", lambda: w._auth_due()),
+        ("token check (strptime)", lambda: wink.need_to_reauth(**w.auth)),
+        ("Wink._get", lambda: w._get("/light_bulbs/1")),
+        ("Wink._get (traced)", lambda: traced._get("/light_bulbs/1")),
+    ]:
+        seconds = min(timeit.repeat(stmt, number=number, repeat=3))
+        print("%-30s %8.2f us" % (name, seconds / number * 1e6))
@@ -0,0 +1,191 @@
+"""Benchmarks of the Wink client against wink.mock.MockCloud, so they run
+without an account and give the same request counts on every run:
+
+    populate        cold populate_devices, then a revalidation (304)
+    iter devices    the streamed listing of iter_devices
+    reads           a get() of every light bulb, one after another
+    cached reads    the same with a cache_ttl, after one round of gets
+    bulk write      bulk_update of all light bulbs
+    token refresh   forced refreshes of the access token
+    schedules       for every outlet, two scheduled states created and
+                    one deleted, with a look at the schedules in between
+
+Each line gives the best time of "repeat" runs, and the requests sent
+per run. Requests are retried through a throttle.ThrottledTransport, so
+injected errors (--error-rate) show up as retries.
+
+"--replay" instead sends the requests of a JSONL log, one exchange per
+line with its "method", "path" and optional "body" (as written by
+wink.replay.RecordingTransport), through the client, and reports their
+timing by endpoint. Lines without a method and path are
+skipped.
+
+Run it from the benchmarks directory: python suite.py [options]
+"""
+
+if __name__ == "__main__":
+    import argparse
+    import collections
+    import json
+    import sys
+    import time
+    try:
+        import wink
+    except ImportError as e:
+        sys.path.insert(0, "..")
+        import wink
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", metavar="FILE")
+    args = parser.parse_args()
+
+    cloud = wink.mock.MockCloud(
+        wink.mock.sample_devices(args.devices),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    transport = wink.throttle.ThrottledTransport(
+        cloud, retries=5, backoff=0.001)
+
+    def client(**kwargs):
+        return wink.Wink(
+            dict(base_url="https://mock.wink", client_id="client",
+                 client_secret="secret", username="user",
+                 password="password"),
+            save_auth=False,
+            transport=transport,
+            **kwargs
+        )
+
+    def run(name, setup, fn):
+        best = None
+        for i in range(args.repeat):
+            state = setup()
+            before = sum(cloud.counts.values())
+            start = time.perf_counter()
+            fn(state)
+            seconds = time.perf_counter() - start
+            sent = sum(cloud.counts.values()) - before
+            best = seconds if best is None else min(best, seconds)
+
+        print("%-16s %10.2f ms %8d requests" % (name, best * 1e3, sent))
+
+    if args.replay:
+        w = client(populate=False)
+        timings = collections.defaultdict(list)
+        skipped = 0
+
+        with open(args.replay) as f:
+            for line in f:
+                exchange = json.loads(line)
+                if "method" not in exchange or "path" not in exchange:
+                    skipped += 1
+                    continue
+
+                path = exchange["path"]
+                route = wink.trace.endpoint(path)
+
+                start = time.perf_counter()
+                try:
+                    w._http(path, exchange["method"],
+                            body=exchange.get("body"),
+                            expected=["200", "201", "202", "204", "304"])
+                except RuntimeError:
+                    pass
+                timings[exchange["method"], route].append(
+                    time.perf_counter() - start)
+
+        for (method, route), times in sorted(timings.items()):
+            print("%-6s %-28s %6d requests %8.3f ms/request" % (
+                method, route, len(times), sum(times) / len(times) * 1e3))
+        print("skipped %d lines" % skipped)
+        sys.exit()
+
+    w = client()
+    bulbs = w.light_bulbs()
+
+    def fresh_client():
+        return client(populate=False)
+
+    def populate(c):
+        c.populate_devices()
+        c.populate_devices()
+
+    run("populate", fresh_client, populate)
+
+    def iterate(c):
+        for device in c.iter_devices():
+            pass
+
+    run("iter devices", fresh_client, iterate)
+
+    def read_all(c):
+        for bulb in c.light_bulbs():
+            bulb.get()
+
+    run("reads", lambda: w, read_all)
+
+    def cached_client():
+        c = client(cache_ttl=3600)
+        for bulb in c.light_bulbs():
+            bulb.is_on()
+        return c
+
+    def read_cached(c):
+        for bulb in c.light_bulbs():
+            bulb.is_on()
+
+    run("cached reads", cached_client, read_cached)
+
+    def bulk_write(c):
+        failed = wink.group.failures(c.bulk_update(
+            bulbs, dict(desired_state=dict(powered=True)),
+            max_concurrency=args.concurrency))
+        if failed:
+            print("%d writes failed" % len(failed))
+
+    run("bulk write", lambda: w, bulk_write)
+
+    def refresh_tokens(c):
+        failed = 0
+        for i in range(100):
+            try:
+                c._authenticate()
+            except RuntimeError:
+                failed += 1
+            c.auth = dict(c.auth, expires="2000-01-01 00:00:00")
+        if failed:
+            print("%d refreshes failed" % failed)
+
+    def expired_client():
+        c = client(populate=False)
+        c._authenticate()
+        c.auth = dict(c.auth, expires="2000-01-01 00:00:00")
+        return c
+
+    run("token refresh", expired_client, refresh_tokens)
+
+    def reconcile(c):
+        for powerstrip in c.powerstrips():
+            for outlet in powerstrip.outlets():
+                outlet.create_schedules([
+                    dict(name="on", powered=True, recurrence="RRULE:A"),
+                    dict(name="off", powered=False, recurrence="RRULE:B"),
+                ], args.concurrency)
+                c.bulk_delete(
+                    [x for x in outlet.schedules() if x.name == "on"],
+                    args.concurrency)
+
+    run("schedules", client, reconcile)
+
+    w.close()
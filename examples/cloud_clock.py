@@ -18,11 +18,15 @@ if __name__ == "__main__":
 
     print("found cloud_clock %s called %s!" % (c.id, c.data.get("name")))
 
-    print("'demoing' each of the dials:")
+    print("'demoing' all of the dials:")
 
+    demos = []
     for i, dial in enumerate(c.dials()):
         print("dial #%d '%s'..." % (i+1, dial.data.get("name")))
-        dial.demo()
+        demos.append(dial.demo())
+
+    for demo in demos:
+        demo.wait()
 
     print("let's switch things up... rotate left!")
     c.rotate()
@@ -9,8 +9,8 @@ if __name__ == "__main__":
 
     w = wink.init("../config.cfg")
 
-    for bulb in w.light_bulbs():
-        bulb.turn_off()
+    bulbs = w.group(w.light_bulbs())
 
-    for bulb in w.light_bulbs():
-        bulb.turn_on()
+    for result in bulbs.turn_off() + bulbs.turn_on():
+        if not result.ok:
+            print("bulb %s failed: %s" % (result.device.id, result.error))
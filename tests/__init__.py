@@ -0,0 +1,25 @@
+"""Behavior tests of the Wink client against wink.mock.MockCloud, so they
+run offline:
+
+    python -m unittest
+"""
+
+import wink
+
+
+def client(cloud, **kwargs):
+    """A Wink client of the mock account served by "cloud"."""
+    kwargs.setdefault("save_auth", False)
+
+    return wink.Wink(
+        dict(base_url="https://mock.wink", client_id="client",
+             client_secret="secret", username="user",
+             password="password"),
+        transport=cloud,
+        **kwargs
+    )
+
+
+def sent(cloud, method):
+    """The number of requests with "method" that reached the cloud."""
+    return sum(n for (m, _), n in cloud.counts.items() if m == method)
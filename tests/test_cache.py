@@ -0,0 +1,63 @@
+import threading
+import unittest
+
+from wink.mock import MockCloud, sample_devices
+
+from . import client, sent
+
+
+class ReadDuringPut(MockCloud):
+    """Reads the device through "reader" while each PUT is in flight,
+    before the cloud applies it."""
+
+    reader = None
+
+    def request(self, url, method="GET", headers=None, body=None):
+        if method == "PUT" and self.reader is not None:
+            thread = threading.Thread(target=self.reader)
+            thread.start()
+            thread.join()
+
+        return MockCloud.request(self, url, method, headers, body)
+
+
+class StateCacheTest(unittest.TestCase):
+
+    def test_cached_reads_skip_the_server(self):
+        cloud = MockCloud(sample_devices(1))
+        w = client(cloud, cache_ttl=60)
+        bulb = w.light_bulb()
+
+        bulb.is_on()
+        bulb.is_on()
+        self.assertEqual(sent(cloud, "GET"), 2)  # listing, first read
+
+    def test_read_while_an_update_is_in_flight_is_not_kept(self):
+        cloud = ReadDuringPut(sample_devices(1))
+        w = client(cloud, cache_ttl=60)
+        bulb = w.light_bulb()
+        self.assertFalse(bulb.is_on())
+
+        cloud.reader = bulb.is_on
+        bulb.turn_on()
+        cloud.reader = None
+
+        self.assertTrue(bulb.is_on())
+
+    def test_coalesced_update_invalidates_right_away(self):
+        cloud = MockCloud(sample_devices(1))
+        w = client(cloud, cache_ttl=60, coalesce_window=60)
+        bulb = w.light_bulb()
+        bulb.is_on()
+
+        bulb.turn_on()
+        reads = sent(cloud, "GET")
+        bulb.is_on()
+        self.assertEqual(sent(cloud, "GET"), reads + 1)
+
+        w.close()
+        self.assertTrue(bulb.is_on())
+
+
+if __name__ == "__main__":
+    unittest.main()
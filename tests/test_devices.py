@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from wink.devices import _Field
+from wink.mock import MockCloud, sample_devices
+from wink.persist import SnapshotFile
+from wink.poller import Poller
+
+from . import client
+
+
+class DeviceListTest(unittest.TestCase):
+
+    def test_populate_adds_and_removes_devices(self):
+        cloud = MockCloud(sample_devices(10))
+        w = client(cloud, conditional_requests=False)
+        bulb = w.light_bulbs()[0]
+
+        cloud.load(sample_devices(5))
+        added, removed = w.populate_devices()
+
+        self.assertEqual(added, [])
+        self.assertEqual(len(removed), 5)
+        self.assertIs(w.light_bulbs()[0], bulb)
+        self.assertEqual(len(w.devices_view()), 5)
+
+    def test_reads_during_revalidation_see_whole_lists(self):
+        cloud = MockCloud(sample_devices(2000))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "devices.snapshot")
+            client(cloud, snapshot=SnapshotFile(path))
+
+            for i in range(3):
+                w = client(cloud, snapshot=SnapshotFile(path))
+                count = len(w.light_bulbs())
+
+                while w._revalidator.is_alive():
+                    self.assertEqual(len(w.light_bulbs()), count)
+                    self.assertIsNotNone(w.light_bulb())
+
+                w.close()
+
+    def test_poller_follows_the_device_list(self):
+        cloud = MockCloud(sample_devices(10))
+        w = client(cloud, conditional_requests=False)
+        poller = Poller(w, min_interval=60)
+
+        cloud.load(sample_devices(4))
+        w.populate_devices()
+        poller.poll_due()
+        self.assertEqual(set(poller._intervals), set(w.devices_view()))
+
+        cloud.load(sample_devices(12))
+        w.populate_devices()
+        poller.poll_due()
+        self.assertEqual(set(poller._intervals), set(w.devices_view()))
+
+
+class Data(object):
+
+    def __init__(self, value):
+        self.data = dict(field=value)
+
+
+class FieldTest(unittest.TestCase):
+
+    def read(self, typ, value):
+        return _Field("field", typ).__get__(Data(value))
+
+    def test_lossless_conversions(self):
+        self.assertEqual(self.read(int, 2.0), 2)
+        self.assertEqual(self.read(int, "3"), 3)
+        self.assertIs(self.read(bool, 1), True)
+        self.assertEqual(self.read(str, 5), "5")
+
+    def test_lossy_values_are_kept(self):
+        self.assertEqual(self.read(int, 0.75), 0.75)
+        self.assertEqual(self.read(bool, "false"), "false")
+        self.assertEqual(self.read(bool, 2), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+
+from wink.group import failures
+from wink.mock import MockCloud, sample_devices
+
+from . import client, sent
+
+
+def cloud_clock(configs):
+    """A cloud_clock with a dial for each (label, channel_id) pair."""
+    return dict(
+        object_type="cloud_clock",
+        cloud_clock_id="1",
+        name="clock",
+        dials=[
+            dict(object_type="dial",
+                 dial_id="1%d" % i,
+                 dial_index=i,
+                 name=label,
+                 label=label,
+                 labels=[label],
+                 channel_configuration=dict(channel_id=channel),
+                 dial_configuration=dict(min_value=0, max_value=100))
+            for i, (label, channel) in enumerate(configs)
+        ],
+    )
+
+
+class GroupTest(unittest.TestCase):
+
+    def test_command_reaches_every_device(self):
+        cloud = MockCloud(sample_devices(12, outlets_every=0))
+        w = client(cloud)
+
+        results = w.group(w.light_bulbs(), max_concurrency=4).turn_on()
+        self.assertEqual(len(results), 12)
+        self.assertEqual(failures(results), [])
+        self.assertTrue(all(bulb.is_on() for bulb in w.light_bulbs()))
+
+    def test_unknown_method_raises(self):
+        w = client(MockCloud(sample_devices(3)))
+
+        with self.assertRaises(AttributeError):
+            w.group(w.light_bulbs()).tunr_off()
+
+
+class CoalescedGroupTest(unittest.TestCase):
+
+    def test_results_are_the_sent_updates(self):
+        cloud = MockCloud(sample_devices(5, outlets_every=0))
+        w = client(cloud, coalesce_window=0.05)
+
+        results = w.group(w.light_bulbs()).turn_on()
+        self.assertEqual(failures(results), [])
+        for result in results:
+            self.assertEqual(result.result["desired_state"]["powered"], True)
+        self.assertEqual(sent(cloud, "PUT"), 5)
+
+    def test_failed_updates_are_reported(self):
+        cloud = MockCloud(sample_devices(5, outlets_every=0))
+        w = client(cloud, coalesce_window=0.05)
+
+        cloud.fail_next(1, "500")
+        results = w.bulk_update(w.light_bulbs(), dict(name="renamed"))
+        self.assertEqual(len(failures(results)), 1)
+
+    def test_updates_to_one_device_are_merged(self):
+        cloud = MockCloud(sample_devices(1))
+        w = client(cloud, coalesce_window=0.05)
+        bulb = w.light_bulb()
+
+        first = bulb.update(dict(name="renamed"))
+        second = bulb.update(dict(desired_state=dict(powered=True)))
+        self.assertIs(first.result(), second.result())
+
+        self.assertEqual(sent(cloud, "PUT"), 1)
+        state = bulb.get(strict=True)
+        self.assertEqual(state["name"], "renamed")
+        self.assertEqual(state["desired_state"],
+                         dict(powered=True, brightness=1.0))
+
+
+class RevertRotateTest(unittest.TestCase):
+
+    def test_revert_sends_only_changed_devices(self):
+        cloud = MockCloud(sample_devices(10))
+        w = client(cloud)
+        strip = w.powerstrip()
+        outlet = strip.outlets()[1]
+
+        w.group([outlet]).update(dict(name="changed"))
+        before = dict(GET=sent(cloud, "GET"), PUT=sent(cloud, "PUT"))
+
+        results = strip.revert()
+        self.assertEqual([r.device for r in results], [outlet])
+        self.assertEqual(sent(cloud, "GET"), before["GET"] + 1)
+        self.assertEqual(sent(cloud, "PUT"), before["PUT"] + 1)
+        self.assertEqual(outlet.get(strict=True)["name"], "outlet 9-1")
+
+    def test_revert_without_changes_sends_nothing(self):
+        cloud = MockCloud(sample_devices(10))
+        w = client(cloud)
+        puts = sent(cloud, "PUT")
+
+        self.assertEqual(w.powerstrip().revert(), [])
+        self.assertEqual(sent(cloud, "PUT"), puts)
+
+    def test_rotate_skips_dials_that_keep_their_configuration(self):
+        cloud = MockCloud([cloud_clock([("a", 1), ("a", 1), ("b", 2)])])
+        w = client(cloud)
+        clock = w.cloud_clock()
+        gets = sent(cloud, "GET")
+
+        results = clock.rotate("left")
+        self.assertEqual(failures(results), [])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(sent(cloud, "GET"), gets + 1)
+        self.assertEqual(sent(cloud, "PUT"), 2)
+
+        labels = [d.get(strict=True)["label"] for d in clock.dials()]
+        self.assertEqual(labels, ["a", "b", "a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import threading
+import unittest
+
+from wink.scheduler import Scheduler
+
+
+class SequenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.log = []
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def step(self, name):
+        return lambda: self.log.append(name)
+
+    def test_steps_run_in_order(self):
+        seq = self.scheduler.sequence([
+            (0, self.step(1)),
+            (0.01, self.step(2)),
+            (0, self.step(3)),
+        ], cleanup=self.step("cleanup"))
+
+        self.assertTrue(seq.wait(5))
+        self.assertEqual(self.log, [1, 2, 3])
+
+    def test_cancel_runs_the_cleanup(self):
+        started = threading.Event()
+        seq = self.scheduler.sequence([
+            (0, lambda: (self.log.append(1), started.set())),
+            (60, self.step(2)),
+        ], cleanup=self.step("cleanup"))
+
+        started.wait(5)
+        self.assertTrue(seq.cancel())
+        self.assertTrue(seq.wait(5))
+        self.assertEqual(self.log, [1, "cleanup"])
+        self.assertFalse(seq.cancel())
+
+    def test_failed_step_stops_the_sequence(self):
+        def fail():
+            raise RuntimeError("step failed")
+
+        seq = self.scheduler.sequence([
+            (0, self.step(1)),
+            (0, fail),
+            (0, self.step(3)),
+        ], cleanup=self.step("cleanup"))
+
+        with self.assertRaises(RuntimeError):
+            seq.wait(5)
+        self.assertEqual(self.log, [1, "cleanup"])
+
+    def test_stop_cancels_unfinished_sequences(self):
+        started = threading.Event()
+        seq = self.scheduler.sequence([
+            (0, lambda: (self.log.append(1), started.set())),
+            (60, self.step(2)),
+        ], cleanup=self.step("cleanup"))
+
+        started.wait(5)
+        self.scheduler.stop()
+
+        self.assertTrue(seq.wait(1))
+        self.assertTrue(seq.done())
+        self.assertTrue(seq.cancelled())
+        self.assertEqual(self.log, [1, "cleanup"])
+
+    def test_stop_finishes_a_cancelled_sequence(self):
+        seq = self.scheduler.sequence([(60, self.step(1))])
+
+        self.scheduler.stop()
+        self.assertTrue(seq.wait(1))
+        self.assertEqual(self.log, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
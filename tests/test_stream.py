@@ -0,0 +1,132 @@
+import json
+import unittest
+
+from wink.mock import MockCloud, sample_devices
+from wink.stream import iter_items
+from wink.trace import Tracer
+
+from . import client
+
+
+def split(text, size):
+    data = text.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class Body(object):
+    """A streamed body in small chunks, which notes whether it was
+    closed."""
+
+    def __init__(self, content, size):
+        self.chunks = iter(split(content.decode("utf-8"), size))
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+class StreamingCloud(MockCloud):
+    """Streams the responses of MockCloud in chunks of 16 bytes."""
+
+    def __init__(self, *args, **kwargs):
+        MockCloud.__init__(self, *args, **kwargs)
+        self.bodies = []
+        self.fail_after = None
+
+    def stream(self, url, method="GET", headers=None, body=None):
+        resp, content = self.request(url, method, headers, body)
+        body = Body(content, 16)
+        if self.fail_after is not None:
+            body.chunks = iter(list(body.chunks)[:self.fail_after])
+        self.bodies.append(body)
+        return resp, body
+
+
+class IterItemsTest(unittest.TestCase):
+
+    document = dict(
+        data=[
+            dict(name="a \"quoted\" {brace} [bracket], comma"),
+            [1, [2, 3], dict(x=None)],
+            "ünïcödé \\ text",
+            12.5e3,
+            True,
+            dict(nested=dict(deeper=["]", "}"])),
+        ],
+        pagination=dict(next="/users/me/wink_devices?page=2"),
+        count=6,
+    )
+
+    def test_items_across_chunk_boundaries(self):
+        text = json.dumps(self.document, ensure_ascii=False)
+
+        for size in range(1, len(text.encode("utf-8")) + 1):
+            rest = {}
+            items = list(iter_items(split(text, size), rest=rest))
+
+            self.assertEqual(items, self.document["data"], size)
+            self.assertEqual(rest, dict(
+                pagination=self.document["pagination"], count=6))
+
+    def test_whitespace_and_empty_list(self):
+        text = ' {\n "count" : 0 ,\n "data" : [ ]\n} '
+
+        for size in (1, 2, 3, 7):
+            rest = {}
+            self.assertEqual(list(iter_items(split(text, size), rest=rest)),
+                             [])
+            self.assertEqual(rest, dict(count=0))
+
+    def test_malformed(self):
+        with self.assertRaises(ValueError):
+            list(iter_items(split('{"data": [1, 2 3]}', 4)))
+
+
+class IterDevicesTest(unittest.TestCase):
+
+    def test_devices_are_streamed(self):
+        cloud = StreamingCloud(sample_devices(25))
+        w = client(cloud, populate=False)
+
+        names = [d.data["name"] for d in w.iter_devices()]
+        self.assertEqual(len(names), 25)
+        self.assertTrue(cloud.bodies[-1].closed)
+
+    def test_stopping_early_closes_the_body_and_traces(self):
+        cloud = StreamingCloud(sample_devices(25))
+        tracer = Tracer()
+        w = client(cloud, populate=False, tracer=tracer)
+
+        devices = w.iter_devices()
+        next(devices)
+        devices.close()
+
+        self.assertTrue(cloud.bodies[-1].closed)
+        self.assertEqual(
+            tracer.requests["GET", "/users/me/wink_devices", "200"], 1)
+
+    def test_truncated_body_is_closed_and_traced_with_the_error(self):
+        cloud = StreamingCloud(sample_devices(25))
+        cloud.fail_after = 10
+        events = []
+        w = client(cloud, populate=False,
+                   tracer=Tracer(exporters=[events.append]))
+
+        with self.assertRaises(ValueError):
+            list(w.iter_devices())
+
+        self.assertTrue(cloud.bodies[-1].closed)
+        requests = [e for e in events if e["kind"] == "request" and
+                    e["path"] == "/users/me/wink_devices"]
+        self.assertEqual(len(requests), 1)
+        self.assertIsInstance(requests[0]["error"], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
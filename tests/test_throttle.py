@@ -0,0 +1,62 @@
+import socket
+import time
+import unittest
+
+from wink.throttle import ThrottledTransport
+from wink.transport import Transport
+
+
+class Scripted(Transport):
+    """Answers with the given responses in turn; an exception is raised."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.methods = []
+
+    def request(self, url, method="GET", headers=None, body=None):
+        self.methods.append(method)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response, b""
+
+
+class RetryTest(unittest.TestCase):
+
+    def test_post_is_not_retried_after_a_connection_error(self):
+        # the server may have created the trigger before timing out
+        transport = Scripted(socket.timeout("timed out"), {"status": "201"})
+        throttled = ThrottledTransport(transport, backoff=0.001)
+
+        with self.assertRaises(socket.timeout):
+            throttled.request("https://mock/x/1/triggers", "POST")
+        self.assertEqual(transport.methods, ["POST"])
+
+    def test_get_is_retried_after_a_connection_error(self):
+        transport = Scripted(socket.timeout("timed out"), {"status": "200"})
+        throttled = ThrottledTransport(transport, backoff=0.001)
+
+        resp, _ = throttled.request("https://mock/x/1", "GET")
+        self.assertEqual(resp["status"], "200")
+        self.assertEqual(throttled.retried, 1)
+
+    def test_post_is_retried_after_a_429(self):
+        transport = Scripted({"status": "429"}, {"status": "201"})
+        throttled = ThrottledTransport(transport, backoff=0.001)
+
+        resp, _ = throttled.request("https://mock/x/1/triggers", "POST")
+        self.assertEqual(resp["status"], "201")
+        self.assertEqual(transport.methods, ["POST", "POST"])
+
+    def test_long_retry_after_is_returned_instead_of_waited_for(self):
+        transport = Scripted({"status": "429", "retry-after": "3600"})
+        throttled = ThrottledTransport(transport, max_backoff=30)
+
+        start = time.monotonic()
+        resp, _ = throttled.request("https://mock/x/1", "GET")
+        self.assertEqual(resp["status"], "429")
+        self.assertLess(time.monotonic() - start, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
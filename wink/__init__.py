@@ -25,12 +25,49 @@ information from the user and saves it to a configuration file 'config.cfg'.
 "init" is another helper function that reads from a config file, instantiates
 the Wink class, and populates the devices from the Wink server.
 
+"Wink.group" bundles devices so that a command, e.g. turn_off, is sent to all
+of them concurrently.
+
+"AsyncWink" is a variant of the Wink class for asyncio applications, whose
+API calls are coroutines.
+
+"mock.MockCloud" is a transport that stands in for the Wink servers, for
+benchmarks and for trying the library without an account.
+
+"replay.RecordingTransport" records the requests to the Wink servers, and
+"replay.ReplayTransport" answers requests from such a recording.
+
+"WinkPool" hosts the clients of many accounts in one process, sharing
+one connection pool and rate limit.
+
 """
 
 from .auth import auth, reauth, need_to_reauth
 
 from . import persist
 
+from . import transport
+
+from . import throttle
+
+from . import subscriptions
+
+from . import mock
+
+from . import trace
+
+from . import replay
+
+from . import stream
+
 from .api import Wink
 
+from .aio import AsyncWink
+
+from .group import DeviceGroup, GroupResult
+
+from .poller import Poller
+
+from .pool import WinkPool
+
 from .util import login, init
@@ -0,0 +1,106 @@
+"""asyncio flavor of the Wink client.
+
+AsyncWink has the same interface as Wink, and uses the same device
+classes, but every method that talks to the Wink servers returns an
+awaitable instead of blocking:
+
+    w = AsyncWink(persist.ConfigFile())
+    await w.populate_devices()
+
+    await asyncio.gather(*[bulb.turn_off() for bulb in w.light_bulbs()])
+
+httplib2 has no asynchronous interface, so the requests themselves are
+run on a pool of worker threads, one per connection of the transport,
+while the event loop only awaits them. This lets one loop drive many
+requests at once.
+"""
+
+import asyncio
+import concurrent.futures
+import inspect
+
+from .api import Wink
+from .group import GroupResult
+
+
+class AsyncWink(Wink):
+    """Wink client for use from an asyncio event loop.
+
+    The devices are not read in the constructor; await
+    "populate_devices" before accessing them.
+
+    "pool_size" limits the number of requests in flight at once.
+
+    The helpers that pause between requests (cloud_clock.dial.demo,
+    cloud_clock.dial.flash_value) and the streamed "iter_devices" are
+    only supported by the blocking Wink client.
+    """
+
+    def __init__(self, auth_object, save_auth=True, debug=False,
+                 cache_ttl=0, transport=None, pool_size=8, rate_limit=None,
+                 retries=3, tracer=None):
+        Wink.__init__(self, auth_object, save_auth=save_auth, debug=debug,
+                      cache_ttl=cache_ttl, populate=False,
+                      transport=transport, pool_size=pool_size,
+                      rate_limit=rate_limit, retries=retries, tracer=tracer)
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=pool_size)
+        self._async_auth_lock = asyncio.Lock()
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _http(self, path, method, headers={}, body=None,
+                    expected="200"):
+        if self._auth_due():
+            # keep the other coroutines from tying up worker threads
+            # while they wait for the token refresh
+            async with self._async_auth_lock:
+                await self._run(self._authenticate)
+
+        resp, content = await self._run(
+            self._request, path, method, headers, body)
+        return self._response(resp, content, method, path, expected)
+
+    def _then(self, value, fn):
+        async def chain():
+            result = value
+            if inspect.isawaitable(result):
+                result = await result
+            result = fn(result)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        return chain()
+
+    def _resolved(self, value):
+        async def resolved():
+            return value
+
+        return resolved()
+
+    def _fan_out(self, items, fn, max_concurrency):
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def call(item):
+            async with semaphore:
+                try:
+                    result = fn(item)
+                    if inspect.isawaitable(result):
+                        result = await result
+                except Exception as e:
+                    return GroupResult(item, error=e)
+                return GroupResult(item, result=result)
+
+        async def fan_out():
+            return list(await asyncio.gather(*[call(x) for x in items]))
+
+        return fan_out()
+
+    def close(self):
+        """Shut down the worker threads and close the connections."""
+        self._executor.shutdown(wait=False)
+        Wink.close(self)
@@ -1,11 +1,72 @@
-import httplib2
-import json
+import concurrent.futures
+import functools
+import threading
+import time
+import types
+import urllib.parse
 from pprint import pprint
 
 from .auth import auth, reauth, need_to_reauth, need_to_auth
+from .auth import monotonic_expiry
+from .catalog import Catalog, by_field, where
+from .codec import default_codec
+from .coalesce import WriteCoalescer
+from .group import DeviceGroup, GroupResult
+from .scheduler import Scheduler
+from .stream import iter_items
+from .throttle import ThrottledTransport
+from .transport import HttpPool
 from . import devices
 
 
+_devices_path = "/users/me/wink_devices"
+
+
+def _data(content):
+    return content.get("data")
+
+
+def _redact(token):
+    # enough of a token to tell tokens apart in debug output
+    if not token:
+        return token
+    return "...%s" % token[-4:]
+
+
+def _copy_content(content):
+    # callers may remove fields from what they get (e.g. get_config), so
+    # hand out copies of cached responses, down to the device dicts
+    content = dict(content)
+    data = content.get("data")
+
+    if isinstance(data, dict):
+        content["data"] = dict(data)
+    elif isinstance(data, list):
+        content["data"] = [
+            dict(x) if isinstance(x, dict) else x for x in data
+        ]
+
+    return content
+
+
+def _counted(chunks, size):
+    for chunk in chunks:
+        size[0] += len(chunk)
+        yield chunk
+
+
+def _device_type(device_info):
+    # Unsure why the old logic was just skimming the end of the first
+    # object with _id, it seems like object_type should be the proper
+    # way to do perform it.
+    if device_info.get("object_type"):
+        return device_info["object_type"]
+
+    for k in device_info:
+        if k.endswith("_id") and hasattr(devices, k[:-3]):
+            return k[:-3]
+
+
 class Wink(object):
     """Main object for making API calls to the Wink cloud servers.
 
@@ -14,6 +75,8 @@ class Wink(object):
 
     "populate_devices" reads the device list from the Wink servers
     and instantiates the appropriate class for each device.
+    "iter_devices" instead yields the devices one at a time as the list
+    is read, for accounts with very many devices.
 
     There are several ways to access the device objects:
     "device_list" gives the full list of top-level devices
@@ -22,19 +85,83 @@ class Wink(object):
     "[device_type]" returns the device object for the first seen
         for the given type
     "[device_type]s" returns a list of all devices of that type
+
+    For frequent lookups, "device", "devices_named" and "parent_of" find
+    devices (including subdevices) through indexes, and "devices_view"
+    and "device_index" give read-only views that are not copied on
+    every call. The indexes are rebuilt by "populate_devices", so a name
+    changed since then is only found under its old name.
+
+    "subscribe" connects a push channel (see the subscriptions module)
+    that keeps the device objects up to date, so reads need no requests;
+    listeners added with DeviceBase.add_listener are told of changes.
+
+    With "coalesce_window", device updates made within that many seconds
+    of each other are merged into one request, and DeviceBase.update
+    returns a future (see the coalesce module).
+
+    With "conditional_requests", GET requests send the ETag of the last
+    response for the same path, and a "304 Not Modified" answer returns
+    that response again without downloading or decoding it.
+
+    The channels, icons and dial templates are fetched once and kept for
+    "catalog_ttl" seconds in "channel_catalog", "icon_catalog" and
+    "dial_template_catalog" (see the catalog module), which also index
+    them; "refresh_catalogs" fetches them again on next use.
+
+    Request and response bodies are converted by "codec" (see the codec
+    module), by default the fastest JSON library available.
+
+    "tracer" is an optional trace.Tracer, which measures the latency and
+    size of every request and counts token refreshes and retries (see
+    the trace module).
+
+    "scheduler" runs timed sequences of actions, e.g. dial animations,
+    in the background (see the scheduler module).
+
+    "cache_ttl" is the number of seconds a device 'get' result is reused
+    by the device readers (e.g. light_bulb.is_on) before fetching it
+    again; the default of 0 disables the cache. It can be overridden for
+    a single device by setting the cache_ttl attribute of the device.
+
+    Requests are sent through "transport" (see the transport module),
+    by default a pool of "pool_size" keep-alive connections that can be
+    used from many threads at once. The default transport sends at most
+    "rate_limit" requests per second (if given) and retries failed
+    requests up to "retries" times (see throttle.ThrottledTransport).
+
+    The access token is refreshed by the first request that finds it
+    about to expire, while concurrent requests wait for that refresh.
+    "start_token_refresher" instead renews it in a background thread
+    ahead of time, so requests never wait for it.
     """
 
     content_headers = {
         "Content-Type": "application/json",
     }
 
-    def __init__(self, auth_object, save_auth=True, debug=False):
+    def __init__(self, auth_object, save_auth=True, debug=False,
+                 cache_ttl=0, populate=True, transport=None, pool_size=8,
+                 lazy=False, rate_limit=None, retries=3,
+                 coalesce_window=None, snapshot=None,
+                 conditional_requests=True, catalog_ttl=3600, codec=None,
+                 tracer=None):
         """
         Provide an object from the persist module, which will be used
         to load and save authentication tokens as needed.
+
+        With "lazy", the devices are read on first access rather than
+        in the constructor.
+
+        "snapshot" is an optional persist.SnapshotFile (or compatible
+        object) that keeps the last device listing. When it has one, the
+        devices are loaded from it without waiting for the Wink servers,
+        and the listing is revalidated in a background thread.
         """
 
         self.debug = debug
+        self.cache_ttl = cache_ttl
+        self.tracer = tracer
 
         if save_auth:
             self.auth_object = auth_object
@@ -43,11 +170,74 @@ class Wink(object):
             self.auth = auth_object
             self.auth_object = None
 
-        self.http = httplib2.Http()
+        if transport is None:
+            transport = ThrottledTransport(
+                HttpPool(pool_size), rate=rate_limit, retries=retries,
+                tracer=tracer)
+        self.transport = transport
+
+        self._auth_lock = threading.Lock()
+        self._refresher = None
+
+        if codec is None:
+            codec = default_codec()
+        self.codec = codec
+
+        self.conditional_requests = conditional_requests
+        # path -> (ETag, decoded response) of the last GET
+        self._validators = {}
+
         self._device_list = []
         self._devices_by_type = {}
 
-        self.populate_devices()
+        self._devices_view = ()
+        self._type_views = {}
+        self._devices_by_key = {}
+        self._devices_by_name = {}
+        self._parents = {}
+        self._device_index = types.MappingProxyType(self._devices_by_key)
+
+        self._subscription = None
+
+        self.scheduler = Scheduler()
+
+        self.channel_catalog = Catalog(self, "/channels", catalog_ttl, dict(
+            by_id=by_field("channel_id"),
+            inbound=where("inbound"),
+            outbound=where("outbound"),
+        ))
+        self.icon_catalog = Catalog(self, "/icons", catalog_ttl, dict(
+            by_id=by_field("icon_id"),
+        ))
+        self.dial_template_catalog = Catalog(
+            self, "/dial_templates", catalog_ttl, dict(
+                by_name=by_field("name"),
+            ))
+
+        self._coalescer = None
+        if coalesce_window:
+            self._coalescer = WriteCoalescer(coalesce_window)
+
+        self.snapshot = snapshot
+        self._revalidator = None
+
+        self._lazy = lazy
+        self._populated = False
+        self._populate_lock = threading.Lock()
+        self._load_lock = threading.RLock()
+
+        if populate and not lazy:
+            self._boot()
+
+    @property
+    def auth(self):
+        return self._auth
+
+    @auth.setter
+    def auth(self, auth_data):
+        # parse the expiration time once, rather than on every request
+        self._auth = auth_data
+        self._expires_at = monotonic_expiry(**auth_data)
 
     def _url(self, path):
         return "%s%s" % (self.auth["base_url"], path)
@@ -58,38 +248,108 @@ class Wink(object):
             "User-Agent": "wink/99.99.99 (iPhone; iOS 7.1.2; Scale/2.0)"
         }
 
-    def _http(self, path, method, headers={}, body=None, expected="200"):
+    def _auth_due(self, tolerance=10):
+        return (self._expires_at is None or
+                time.monotonic() + tolerance >= self._expires_at)
+
+    def _authenticate(self, tolerance=10):
+        if self._auth_due(tolerance):
+            # only one thread refreshes the token, the others wait for it
+            with self._auth_lock:
+                if self._auth_due(tolerance):
+                    self._refresh_auth(tolerance)
+
+        if self.debug:
+            print("Authentication being used:\n" \
+                "\tAccess token : %s\n" \
+                "\tRefresh token : %s" % (
+                    _redact(self.auth['access_token']),
+                    _redact(self.auth['refresh_token'])))
+
+    def _refresh_auth(self, tolerance):
         # have we ever authed?
         if need_to_auth(**self.auth):
             if self.debug:
                 print("Getting first access token")
-            self.auth = auth(**self.auth)
+            self.auth = self._traced_auth("auth", auth)
 
         # see if we need to reauth?
-        if need_to_reauth(**self.auth):
+        if need_to_reauth(tolerance, **self.auth):
             if self.debug:
                 print("Refreshing access token")
 
             # TODO add error handling
-            self.auth = reauth(**self.auth)
+            self.auth = self._traced_auth("reauth", reauth)
 
             if self.auth_object is not None:
                 self.auth_object.save(self.auth)
 
-        if self.debug:
-            print("Authentication being used:\n" \
-                "\tAccess token : %s\n" \
-                "\tRefresh token : %s" % (self.auth['access_token'],
-                                          self.auth['refresh_token']))
+    def _traced_auth(self, kind, fn):
+        if self.tracer is None:
+            return fn(transport=self.transport, **self.auth)
 
+        start = time.perf_counter()
+        try:
+            result = fn(transport=self.transport, **self.auth)
+        except Exception as e:
+            self.tracer.auth(kind, time.perf_counter() - start, e)
+            raise
+
+        self.tracer.auth(kind, time.perf_counter() - start)
+        return result
+
+    def _seconds_to_expiry(self):
+        return self._expires_at - time.monotonic()
+
+    def start_token_refresher(self, margin=60, retry_delay=30):
+        """
+        Renew the access token in a background thread, "margin" seconds
+        before it expires. Failed attempts are retried after
+        "retry_delay" seconds.
+        """
+        if self._refresher is not None:
+            return
+
+        stop = threading.Event()
+
+        def refresh():
+            while not stop.is_set():
+                try:
+                    self._authenticate(margin)
+                    delay = max(self._seconds_to_expiry() - margin, 1)
+                except Exception as e:
+                    if self.debug:
+                        print("Refreshing access token failed:", e)
+                    delay = retry_delay
+
+                stop.wait(delay)
+
+        thread = threading.Thread(target=refresh, name="wink-token-refresher")
+        thread.daemon = True
+        self._refresher = (thread, stop)
+        thread.start()
+
+    def stop_token_refresher(self):
+        if self._refresher is None:
+            return
+
+        thread, stop = self._refresher
+        self._refresher = None
+        stop.set()
+        thread.join()
+
+    def _request(self, path, method, headers={}, body=None):
         # add the auth header
         all_headers = self._headers()
         all_headers.update(headers)
 
+        if method == "GET" and path in self._validators:
+            all_headers["If-None-Match"] = self._validators[path][0]
+
         if body:
             all_headers.update(Wink.content_headers)
-            if type(body) is not str:
-                body = json.dumps(body)
+            if not isinstance(body, (str, bytes)):
+                body = self.codec.encode(body)
 
         if self.debug:
             print("Request: %s %s" % (method, path))
@@ -99,14 +359,40 @@ class Wink(object):
                 print("Body:", end=' ')
                 pprint(body)
 
-        resp, content = self.http.request(
-            self._url(path),
-            method,
-            headers=all_headers,
-            body=body
-        )
+        if self.tracer is None:
+            return self.transport.request(
+                self._url(path),
+                method,
+                headers=all_headers,
+                body=body
+            )
 
-        content = content.decode('utf-8')
+        return self._traced_request(path, method, all_headers, body)
+
+    def _traced_request(self, path, method, headers, body):
+        sent = len(body) if body else 0
+        start = time.perf_counter()
+
+        try:
+            resp, content = self.transport.request(
+                self._url(path), method, headers=headers, body=body)
+        except Exception as e:
+            self.tracer.request(method, path, None,
+                                time.perf_counter() - start, sent, 0, e)
+            raise
+
+        self.tracer.request(method, path, resp["status"],
+                            time.perf_counter() - start, sent,
+                            len(content) if content else 0)
+        return resp, content
+
+    def _response(self, resp, content, method, path, expected="200"):
+        if resp["status"] == "304" and method == "GET":
+            cached = self._validators.get(path)
+            if cached is not None:
+                if self.debug:
+                    print("Response: 304, reusing the cached response")
+                return _copy_content(cached[1])
 
         if self.debug:
             print("Response:", resp["status"])
@@ -114,11 +400,13 @@ class Wink(object):
         # coerce to JSON, if possible
         if content:
             try:
-                content = json.loads(content)
-                if "errors" in content and content["errors"]:
-                    raise RuntimeError("\n".join(content["errors"]))
-            except:
-                pass
+                content = self.codec.decode(content)
+            except ValueError:
+                content = content.decode('utf-8', 'replace')
+            else:
+                if isinstance(content, dict) and content.get("errors"):
+                    raise RuntimeError("\n".join(
+                        str(e) for e in content["errors"]))
 
         if self.debug:
             pprint(content)
@@ -136,23 +424,95 @@ class Wink(object):
                 )
             )
 
+        if (method == "GET" and self.conditional_requests and
+                resp.get("etag") and isinstance(content, dict)):
+            self._validators[path] = (resp["etag"], content)
+            content = _copy_content(content)
+
         if content:
             return content
         return {}
 
+    def _http(self, path, method, headers={}, body=None, expected="200"):
+        self._authenticate()
+        resp, content = self._request(path, method, headers, body)
+        return self._response(resp, content, method, path, expected)
+
+    def _then(self, value, fn):
+        """
+        Apply fn to the result of an API call. Code shared with AsyncWink
+        (e.g. the device classes) chains on results through this, since
+        there the result is an awaitable.
+        """
+        return fn(value)
+
+    def _resolved(self, value):
+        """Wrap a value that needs no API call like an API call result."""
+        return value
+
+    def _fan_out(self, items, fn, max_concurrency):
+        """
+        Call fn on each item using up to max_concurrency threads, and
+        return a GroupResult for each item.
+
+        Coalesced updates return a Future; these are waited for once all
+        items are called, so the GroupResult holds the outcome of the
+        request that was actually sent.
+        """
+        def call(item):
+            try:
+                return GroupResult(item, result=fn(item))
+            except Exception as e:
+                return GroupResult(item, error=e)
+
+        if not items:
+            return []
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(items))) as pool:
+            results = list(pool.map(call, items))
+
+        for r in results:
+            if isinstance(r.result, concurrent.futures.Future):
+                try:
+                    r.result = r.result.result()
+                except Exception as e:
+                    r.result, r.error = None, e
+
+        return results
+
     def _get(self, path):
-        return self._http(path, "GET").get("data")
+        return self._then(self._http(path, "GET"), _data)
 
     def _put(self, path, data):
-        return self._http(path, "PUT", body=data).get("data")
+        return self._then(self._http(path, "PUT", body=data), _data)
 
     def _post(self, path, data):
-        return self._http(path, "POST", body=data,
-                          expected=["200", "201", "202"]).get("data")
+        return self._then(
+            self._http(path, "POST", body=data,
+                       expected=["200", "201", "202"]),
+            _data
+        )
 
     def _delete(self, path):
         return self._http(path, "DELETE", expected="204")
 
+    def close(self):
+        """
+        Wait for a running revalidation, stop scheduled actions (running
+        the cleanup of unfinished sequences), send pending coalesced
+        updates, stop the token refresher and the subscription, if any,
+        and close the connections of the transport.
+        """
+        if self._revalidator is not None:
+            self._revalidator.join()
+        self.scheduler.stop()
+        if self._coalescer is not None:
+            self._coalescer.flush()
+        self.stop_token_refresher()
+        self.unsubscribe()
+        self.transport.close()
+
     def get_profile(self):
         return self._get("/users/me")
 
@@ -163,7 +523,76 @@ class Wink(object):
         return self.update_profile(dict(email=email))
 
     def get_devices(self):
-        return self._get("/users/me/wink_devices")
+        return self._get(_devices_path)
+
+    def iter_devices(self):
+        """
+        Yield a new object for each device of the account while the
+        device list is read from the Wink servers, following its
+        "pagination" to the next page if there is one. Only one device
+        is decoded at a time, so memory use does not grow with the
+        number of devices.
+
+        The devices are not added to the device lists of this object;
+        populate_devices does that.
+        """
+        url = self._url(_devices_path)
+
+        while url:
+            rest = {}
+
+            for device_info in self._stream_items(url, rest):
+                device_type = _device_type(device_info)
+                if device_type is not None:
+                    yield getattr(devices, device_type)(self, device_info)
+
+            url = (rest.get("pagination") or {}).get("next")
+            if url and "://" not in url:
+                url = self._url(url)
+
+    def _stream_items(self, url, rest):
+        self._authenticate()
+        path = urllib.parse.urlsplit(url).path
+
+        if self.debug:
+            print("Request: GET %s (streamed)" % url)
+
+        start = time.perf_counter()
+        try:
+            resp, chunks = self.transport.stream(url, "GET",
+                                                 headers=self._headers())
+        except Exception as e:
+            if self.tracer is not None:
+                self.tracer.request("GET", path, None,
+                                    time.perf_counter() - start, 0, 0, e)
+            raise
+
+        received = [0]
+        body = chunks
+        if self.tracer is not None:
+            body = _counted(chunks, received)
+
+        error = None
+        try:
+            if resp["status"] != "200":
+                # read the error in full, to raise it
+                self._response(resp, b"".join(body), "GET", path)
+
+            for item in iter_items(body, rest=rest):
+                yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # also when the caller stops early, so the connection is not
+            # left open until garbage collection
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+            if self.tracer is not None:
+                self.tracer.request("GET", path, resp["status"],
+                                    time.perf_counter() - start, 0,
+                                    received[0], error)
 
     def get_geofences(self):
         return self._get("/users/me/geofences")
@@ -175,73 +604,310 @@ class Wink(object):
         return self._post("/users/me/linked_services", data)
 
     def get_icons(self):
-        return self._get("/icons")
+        return self.icon_catalog.items()
 
     def get_channels(self):
-        return self._get("/channels")
+        return self.channel_catalog.items()
 
     def get_inbound_channels(self):
-        return [x for x in self.get_channels() if x["inbound"]]
+        return self._then(self.channel_catalog.index("inbound"), list)
 
     def get_outbound_channels(self):
-        return [x for x in self.get_channels() if x["outbound"]]
+        return self._then(self.channel_catalog.index("outbound"), list)
+
+    def refresh_catalogs(self):
+        """Fetch the channels, icons and dial templates again on next use."""
+        self.channel_catalog.refresh()
+        self.icon_catalog.refresh()
+        self.dial_template_catalog.refresh()
 
     def populate_devices(self):
-        devices_info = self.get_devices()
+        """
+        Read the device list from the Wink servers and bring the device
+        objects up to date with it: devices seen before are updated in
+        place, new ones are instantiated and removed ones are dropped.
 
-        # clean up data structures, just in case this is called
-        # multiple times in the same instance.
-        del self._device_list[:]
-        for device_type in self._devices_by_type:
-            delattr(self, device_type)
-            delattr(self, "%ss" % device_type)
-        self._devices_by_type.clear()
+        Returns the lists of added and of removed devices.
+        """
+        # an explicit populate and a background revalidation must not
+        # interleave
+        with self._load_lock:
+            return self._then(self.get_devices(), self._load_listing)
 
-        for device_info in devices_info:
-            device_type = None
+    def _load_listing(self, devices_info):
+        with self._load_lock:
+            result = self._load_devices(devices_info)
+            self.save_snapshot()
+        return result
 
-            # Unsure why the old logic was just skimming the end of the first
-            # object with _id, it seems like object_type should be the proper
-            # way to do perform it.
-            if device_info["object_type"]:
-                device_type = device_info["object_type"]
-            else:
-                for k in device_info:
-                    if k.endswith("_id") and hasattr(devices, k[:-3]):
-                        device_type = k[:-3]
-                        break
+    def _boot(self):
+        saved = self.snapshot.load() if self.snapshot is not None else None
+
+        if not saved or "devices" not in saved:
+            self.populate_devices()
+            return
+
+        if saved.get("etag") and self.conditional_requests:
+            self._validators[_devices_path] = (
+                saved["etag"], dict(data=saved["devices"]))
+
+        self._load_devices(saved["devices"])
+        self.revalidate()
+
+    def revalidate(self):
+        """Run populate_devices in a background thread."""
+
+        def populate():
+            try:
+                self.populate_devices()
+            except Exception as e:
+                if self.debug:
+                    print("Revalidating the device list failed:", e)
+
+        self._revalidator = threading.Thread(target=populate,
+                                             name="wink-revalidate")
+        self._revalidator.daemon = True
+        self._revalidator.start()
+
+    def save_snapshot(self):
+        """Save the current device data to the snapshot, if any."""
+        if self.snapshot is None:
+            return
+
+        etag, _ = self._validators.get(_devices_path, (None, None))
+
+        self.snapshot.save(dict(
+            saved_at=time.time(),
+            etag=etag,
+            devices=[device.data for device in self._device_list],
+        ))
+
+    def _ensure_devices(self):
+        if self._lazy and not self._populated:
+            with self._populate_lock:
+                if not self._populated:
+                    self._boot()
+
+    def __getattr__(self, name):
+        # the "[device_type]" and "[device_type]s" accessors
+        if name.startswith("_") or "_populate_lock" not in self.__dict__:
+            raise AttributeError(name)
+
+        self._ensure_devices()
+
+        if name in self._devices_by_type:
+            return functools.partial(self._first_device, name)
+
+        if name.endswith("s") and name[:-1] in self._devices_by_type:
+            return functools.partial(self.devices_by_type, name[:-1])
+
+        raise AttributeError(name)
+
+    def _first_device(self, device_type):
+        return self._devices_by_type[device_type][0]
+
+    def _load_devices(self, devices_info):
+        with self._load_lock:
+            return self._load_device_list(devices_info)
+
+    def _load_device_list(self, devices_info):
+        known = dict(
+            ((device.device_type(), device.id), device)
+            for device in self._device_list
+        )
+
+        added = []
+        device_list = []
+        devices_by_type = {}
+
+        for device_info in devices_info:
+            device_type = _device_type(device_info)
 
             if device_type is None:
                 continue
 
             device_cls = getattr(devices, device_type)
-            device_obj = device_cls(self, device_info)
+            key = (device_type, device_info["%s_id" % device_type])
+
+            device_obj = known.pop(key, None)
+            if device_obj is None:
+                device_obj = device_cls(self, device_info)
+                added.append(device_obj)
+            else:
+                device_obj._load(device_info)
 
             # update some data structures to provide access to the devices
-            self._device_list.append(device_obj)
+            device_list.append(device_obj)
+
+            if device_type not in devices_by_type:
+                devices_by_type[device_type] = []
+
+            devices_by_type[device_type].append(device_obj)
+
+        # swap in the complete list, so concurrent readers never see a
+        # partially rebuilt one
+        self._device_list = device_list
+        self._devices_by_type = devices_by_type
+
+        self._index_devices()
+        self._populated = True
+
+        return added, list(known.values())
+
+    def _index_devices(self):
+        by_key = {}
+        by_name = {}
+        parents = {}
+
+        def index(device, parent):
+            key = (device.device_type(), str(device.id))
+            by_key[key] = device
+
+            name = device.data.get("name")
+            if name is not None:
+                by_name.setdefault(name, []).append(device)
 
-            if not hasattr(self, device_type):
-                setattr(self,
-                        device_type,
-                        self._get_device_func(device_obj))
-                self._devices_by_type[device_type] = []
-                setattr(self,
-                        "%ss" % device_type,
-                        self._get_device_list_func(device_type))
+            if parent is not None:
+                parents[key] = parent
 
-            self._devices_by_type[device_type].append(device_obj)
+            for subdevice in device.subdevices_view():
+                index(subdevice, device)
 
-    def _get_device_func(self, device_object):
-        return lambda: device_object
+        for device in self._device_list:
+            index(device, None)
 
-    def _get_device_list_func(self, device_type):
-        return lambda: list(self._devices_by_type[device_type])
+        # swap in complete indexes, so concurrent readers never see
+        # partially built ones
+        self._devices_view = tuple(self._device_list)
+        self._type_views = dict(
+            (typ, tuple(devices_of_type))
+            for typ, devices_of_type in self._devices_by_type.items()
+        )
+        self._devices_by_name = dict(
+            (name, tuple(named)) for name, named in by_name.items()
+        )
+        self._parents = parents
+        self._devices_by_key = by_key
+        self._device_index = types.MappingProxyType(by_key)
+
+    def subscribe(self, subscription):
+        """
+        Start receiving pushed state changes from a subscription object.
+        While subscribed, device reads use the pushed state instead of
+        fetching it, unless a device has a cache_ttl of its own.
+        """
+        self.unsubscribe()
+        self._subscription = subscription
+        subscription.start(self._deliver_update)
+
+    def _deliver_update(self, message):
+        try:
+            self.apply_update(message)
+        except Exception as e:
+            if self.debug:
+                print("Failed to apply pushed message:", e)
+
+    def unsubscribe(self):
+        if self._subscription is None:
+            return
+
+        subscription = self._subscription
+        self._subscription = None
+        subscription.stop()
+
+        for device in self._devices_by_key.values():
+            device.invalidate()
+
+    def apply_update(self, message):
+        """
+        Apply a pushed device state message to its device object, and
+        return the device, or None if the device is not known.
+        """
+        if isinstance(message, (str, bytes)):
+            message = self.codec.decode(message)
+
+        if isinstance(message.get("data"), dict):
+            message = message["data"]
+
+        device_type = _device_type(message)
+        if device_type is None:
+            return None
+
+        device_id = message.get("%s_id" % device_type)
+        device = self._devices_by_key.get((device_type, str(device_id)))
+
+        if device is not None:
+            device._apply(message)
+
+        return device
+
+    def group(self, devices, max_concurrency=8):
+        """
+        Group devices, so that commands called on the group are sent to
+        all of them concurrently, e.g. w.group(w.light_bulbs()).turn_off()
+        """
+        return DeviceGroup(self, devices, max_concurrency)
+
+    def bulk_update(self, devices, data, max_concurrency=8):
+        """Update all devices with the same data concurrently."""
+        return self.group(devices, max_concurrency).update(data)
+
+    def bulk_delete(self, resources, max_concurrency=8):
+        """
+        Delete resources (e.g. triggers, alarms or scheduled outlet
+        states, of any devices) concurrently, and return a GroupResult
+        for each.
+        """
+        return self._fan_out(
+            list(resources),
+            lambda resource: resource.delete(),
+            max_concurrency
+        )
+
+    def device(self, device_type, device_id):
+        """
+        Find a device or subdevice by its type and id, or None if there
+        is no such device.
+        """
+        self._ensure_devices()
+        return self._devices_by_key.get((device_type, str(device_id)))
+
+    def devices_named(self, name):
+        """All devices and subdevices with the given name, as a tuple."""
+        self._ensure_devices()
+        return self._devices_by_name.get(name, ())
+
+    def parent_of(self, device):
+        """The device a subdevice belongs to, or None."""
+        self._ensure_devices()
+        return self._parents.get((device.device_type(), str(device.id)))
+
+    def devices_view(self, typ=None):
+        """
+        Tuple of the top-level devices, or of those of the given type.
+        Unlike device_list, it is not copied on every call.
+        """
+        self._ensure_devices()
+        if typ is None:
+            return self._devices_view
+        return self._type_views.get(typ, ())
+
+    def device_index(self):
+        """
+        Read-only mapping of (device type, id) to each device and
+        subdevice.
+        """
+        self._ensure_devices()
+        return self._device_index
 
     def device_list(self):
+        self._ensure_devices()
         return list(self._device_list)
 
     def device_types(self):
+        self._ensure_devices()
         return list(self._devices_by_type)
 
     def devices_by_type(self, typ):
+        self._ensure_devices()
         return list(self._devices_by_type.get(typ, []))
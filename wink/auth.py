@@ -8,13 +8,18 @@ Both auth and reauth functions require the following kwargs:
 """
 
 import datetime
-import httplib2
 import json
+import time
+
+from .transport import HttpPool
 
 default_expires_in = 900
 
 _datetime_format = "%Y-%m-%d %H:%M:%S"  # assume UTC
 
+# used when the caller does not pass a transport of its own
+_default_transport = HttpPool(2)
+
 
 def _datetime_serialize(dt):
     return dt.strftime(_datetime_format)
@@ -52,7 +57,21 @@ def need_to_reauth(tolerance=10, **kwargs):
     return now >= expires
 
 
-def auth(grant_type="password", auth_path="/oauth2/token", **kwargs):
+def monotonic_expiry(**kwargs):
+    """Translate the expiration time of the access token to the clock of
+    time.monotonic(), or None if there is no valid access token.
+    """
+    if need_to_auth(**kwargs) or not kwargs.get("expires"):
+        return None
+
+    expires = _datetime_deserialize(kwargs["expires"])
+    remaining = (expires - datetime.datetime.utcnow()).total_seconds()
+
+    return time.monotonic() + remaining
+
+
+def auth(grant_type="password", auth_path="/oauth2/token", transport=None,
+         **kwargs):
     """Do password authentication.
 
     Also requires kwargs "username" and "password".
@@ -67,13 +86,13 @@ def auth(grant_type="password", auth_path="/oauth2/token", **kwargs):
     elif 'user_id' in list(kwargs.keys()):
         data['user_id'] = kwargs['user_id']
 
-    result = _auth(data, auth_path=auth_path, **kwargs)
+    result = _auth(data, auth_path=auth_path, transport=transport, **kwargs)
     del result["password"]
 
     return result
 
 
-def reauth(**kwargs):
+def reauth(transport=None, **kwargs):
     """Use the refresh token to update the access token.
 
     Also requires kwarg "refresh_token".
@@ -83,18 +102,20 @@ def reauth(**kwargs):
         refresh_token=kwargs["refresh_token"],
     )
 
-    return _auth(data, **kwargs)
+    return _auth(data, transport=transport, **kwargs)
 
 
-def _auth(data, auth_path="/oauth2/token", **kwargs):
+def _auth(data, auth_path="/oauth2/token", transport=None, **kwargs):
     body = dict(
         client_id=kwargs["client_id"],
         client_secret=kwargs["client_secret"],
         **data
     )
 
-    http = httplib2.Http()
-    resp, content = http.request(
+    if transport is None:
+        transport = _default_transport
+
+    resp, content = transport.request(
         "".join([kwargs["base_url"], auth_path]),
         "POST",
         headers={"Content-Type": "application/json"},
@@ -0,0 +1,78 @@
+"""Reference datasets that rarely change, like the channels, icons and
+dial templates, fetched once and reused.
+
+A Catalog fetches its path on first use and keeps the result for "ttl"
+seconds (forever if None); "refresh" forces the next use to fetch it
+again. Each fetch also builds the catalog's indexes, e.g.
+
+    w.channel_catalog.index("by_id")["10"]
+    w.channel_catalog.index("inbound")
+
+Indexes are shared, so treat them as read-only.
+"""
+
+import time
+
+
+def by_field(field):
+    """Index builder mapping the value of "field" to each item."""
+    return lambda items: dict((x[field], x) for x in items)
+
+
+def where(field):
+    """Index builder listing the items whose "field" is truthy."""
+    return lambda items: [x for x in items if x.get(field)]
+
+
+class Catalog(object):
+    """A dataset fetched from one path, with indexes over its items."""
+
+    def __init__(self, wink, path, ttl=3600, indexes=None):
+        """
+        "indexes" maps index names to functions that build the index
+        from the list of items.
+        """
+        self.wink = wink
+        self.path = path
+        self.ttl = ttl
+        self.index_builders = dict(indexes or {})
+
+        self._items = None
+        self._indexes = {}
+        self._fetched = 0
+
+    def _fresh(self):
+        if self._items is None:
+            return False
+        if self.ttl is None:
+            return True
+        return time.monotonic() - self._fetched < self.ttl
+
+    def _store(self, items):
+        items = items or []
+
+        self._indexes = dict(
+            (name, build(items))
+            for name, build in self.index_builders.items()
+        )
+        self._items = items
+        self._fetched = time.monotonic()
+
+        return items
+
+    def _load(self):
+        if self._fresh():
+            return self.wink._resolved(self._items)
+        return self.wink._then(self.wink._get(self.path), self._store)
+
+    def refresh(self):
+        """Drop the cached items, so the next use fetches them again."""
+        self._items = None
+
+    def items(self):
+        """All items, as a new list."""
+        return self.wink._then(self._load(), list)
+
+    def index(self, name):
+        return self.wink._then(
+            self._load(), lambda items: self._indexes[name])
@@ -0,0 +1,83 @@
+"""Coalescing of rapid successive updates to the same device.
+
+With Wink(coalesce_window=0.1), DeviceBase.update does not send its data
+right away. Updates to the same device within the window are merged
+(later values win, nested dicts such as desired_state are merged key by
+key) and sent as a single request. update then returns a
+concurrent.futures.Future, which resolves to the result of the merged
+request once it completes.
+
+Updates to one device are sent in order: while a merged update is in
+flight, new updates are merged into the next one.
+"""
+
+import concurrent.futures
+import threading
+
+
+def _merge(target, data):
+    for k, v in data.items():
+        if isinstance(v, dict) and isinstance(target.get(k), dict):
+            merged = dict(target[k])
+            _merge(merged, v)
+            target[k] = merged
+        else:
+            target[k] = v
+
+
+class WriteCoalescer(object):
+    """Merges the updates to each device made within "window" seconds."""
+
+    def __init__(self, window):
+        self.window = window
+
+        self._pending = {}
+        self._sending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, device, data):
+        future = concurrent.futures.Future()
+
+        with self._lock:
+            pending = self._pending.get(device)
+
+            if pending is None:
+                pending = self._pending[device] = ({}, [])
+                self._sending.setdefault(device, threading.Lock())
+
+                timer = threading.Timer(self.window, self._send, (device,))
+                timer.daemon = True
+                timer.start()
+
+            _merge(pending[0], data)
+            pending[1].append(future)
+
+        return future
+
+    def _send(self, device):
+        with self._sending[device]:
+            with self._lock:
+                pending = self._pending.pop(device, None)
+
+            # already sent along with an earlier batch
+            if pending is None:
+                return
+
+            data, futures = pending
+
+            try:
+                result = device._send_update(data)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future in futures:
+                    future.set_result(result)
+
+    def flush(self):
+        """Send all pending updates now."""
+        with self._lock:
+            devices = list(self._pending)
+
+        for device in devices:
+            self._send(device)
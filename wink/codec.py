@@ -0,0 +1,45 @@
+"""Codecs turn request bodies into bytes and response bodies back into
+Python objects.
+
+A codec has two methods, "encode" (object to bytes) and "decode"
+(bytes to object, raising ValueError for malformed input). Both work on
+bytes directly, without an intermediate str copy of the body where the
+JSON library allows it.
+
+"default_codec" uses orjson if it is installed, and the json module of
+the standard library otherwise.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONCodec(object):
+    """JSON codec based on the json module of the standard library."""
+
+    def encode(self, obj):
+        return json.dumps(obj).encode("utf-8")
+
+    def decode(self, content):
+        # json.loads detects the encoding of bytes itself
+        return json.loads(content)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on orjson, which parses bytes natively."""
+
+    def encode(self, obj):
+        return orjson.dumps(obj)
+
+    def decode(self, content):
+        return orjson.loads(content)
+
+
+def default_codec():
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
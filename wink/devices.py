@@ -1,19 +1,106 @@
 from .interfaces import *
 
+import functools
 import time
 
 
+def _reader(method):
+    """
+    Decorate a device reader that takes the last_reading of the device,
+    so it is called without arguments and works with both the blocking
+    and the asyncio client.
+    """
+
+    @functools.wraps(method)
+    def read(self):
+        return self.wink._then(
+            self._get_last_reading(),
+            lambda last: method(self, last)
+        )
+
+    return read
+
+
+class _Field(object):
+    """
+    Class-level accessor for one of the mutable_fields of a device or
+    resource, read from its data and converted to the declared type
+    only when accessed. Values that would not survive the conversion
+    (e.g. 0.75 as an int, or "false" as a bool) are returned as they are.
+    """
+
+    __slots__ = ("name", "type")
+
+    def __init__(self, name, typ):
+        self.name = name
+        self.type = typ
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+
+        value = obj.data.get(self.name)
+
+        if (value is None or isinstance(value, (self.type, dict, list))):
+            return value
+
+        try:
+            converted = self.type(value)
+            lossless = type(value)(converted) == value
+        except (TypeError, ValueError):
+            return value
+
+        return converted if lossless else value
+
+
+def _add_fields(cls):
+    for name, typ in cls.__dict__.get("mutable_fields", []):
+        if not hasattr(cls, name):
+            setattr(cls, name, _Field(name, typ))
+
+
+# shared by all devices without subdevices, never modified
+_no_subdevices = {}
+
+
+def _subdevices_accessor(subdevice_plural):
+    def subdevices(self):
+        return self.subdevices_by_type(subdevice_plural)
+
+    subdevices.__name__ = subdevice_plural
+    return subdevices
+
+
+def config_diff(current, target):
+    """
+    The fields of the target configuration whose values differ from
+    the current configuration.
+    """
+    return dict(
+        (k, v) for k, v in target.items()
+        if k not in current or current[k] != v
+    )
+
+
 class CreatableResourceBase(object):
     """Base class for 'creatable' objects, e.g.:
         - triggers
         - alarms
         - scheduled_outlet_states
 
+    The resources of a device are kept in a cache of the device (see
+    DeviceBase._resources), which update and delete keep in sync.
     """
 
-    # TODO add automatic getters/setters for these fields
+    # each is readable as an attribute, e.g. trigger.enabled
     mutable_fields = []
 
+    __slots__ = ("parent", "data", "id")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _add_fields(cls)
+
     def __init__(self, parent, data):
         self.parent = parent
         self.data = data
@@ -26,18 +113,46 @@ class CreatableResourceBase(object):
     def resource_type(self):
         return self.__class__.__name__
 
-    def get(self):
-        return self.parent.wink._get(self._path())
+    def _field(self):
+        # the field of the device state listing these resources
+        return "%ss" % self.resource_type()
+
+    def get(self, strict=False):
+        """
+        Fetch the resource, unless the device has it cached; strict
+        always fetches it.
+        """
+        if not strict:
+            cached = self.parent._cached_resource(self._field(), self.id)
+            if cached is not None:
+                return self.parent.wink._resolved(dict(cached))
+
+        return self.parent.wink._then(
+            self.parent.wink._get(self._path()), self._store)
+
+    def _store(self, data):
+        if data:
+            self.data = data
+            self.parent._cache_resource(self._field(), self.id, data)
+        return data
 
     def update(self, data):
-        return self.parent.wink._put(self._path(), data)
+        return self.parent.wink._then(
+            self.parent.wink._put(self._path(), data), self._store)
 
     def delete(self):
-        return self.parent.wink._delete(self._path())
+        def forget(result):
+            self.parent._forget_resource(self._field(), self.id)
+            return result
+
+        return self.parent.wink._then(
+            self.parent.wink._delete(self._path()), forget)
 
 
 class CreatableSubResourceBase(CreatableResourceBase):
 
+    __slots__ = ()
+
     def _path(self):
         return "%s%s" % (
             self.parent._path(),
@@ -57,42 +172,128 @@ class DeviceBase(object):
     # the 'state' and 'configuration' of the device
     non_config_fields = []
 
-    # TODO add automatic getters/setters for these fields
+    # each is readable as an attribute, e.g. light_bulb.name
     mutable_fields = []
 
+    # a "[subdevice_type]s" method listing the subdevices of each type
+    # is added to the class, e.g. powerstrip.outlets
     subdevice_types = []
 
+    # device objects can be numerous, so they have no __dict__;
+    # subclasses should declare __slots__ too
+    __slots__ = (
+        "wink",
+        "data",
+        "id",
+        "_cache_ttl",
+        "_state",
+        "_state_time",
+        "_original",
+        "_listeners",
+        "_subdevice_views",
+        "_collections",
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _add_fields(cls)
+
+        for subdevice_type in cls.__dict__.get("subdevice_types", []):
+            subdevice_plural = "%ss" % subdevice_type.__name__
+            if not hasattr(cls, subdevice_plural):
+                setattr(cls,
+                        subdevice_plural,
+                        _subdevices_accessor(subdevice_plural))
+
     def __init__(self, wink, data):
         self.wink = wink
         self.data = data
 
         self.id = data["%s_id" % self.device_type()]
 
-        self._subdevices = []
+        self._cache_ttl = None
+        self._state = None
+        self._state_time = 0
+
+        # what revert goes back to; data is never modified in place
+        self._original = data
+
+        self._listeners = None
+
+        # resource field (e.g. "triggers") -> {id: data}, see _resources
+        self._collections = None
+
+        self._load_subdevices({})
+
+    @property
+    def cache_ttl(self):
+        """
+        Number of seconds a 'get' result is reused before the device is
+        fetched again; None falls back to the cache_ttl of the Wink
+        object.
+        """
+        return self._cache_ttl
+
+    @cache_ttl.setter
+    def cache_ttl(self, ttl):
+        self._cache_ttl = ttl
+
+    def _load(self, data):
+        """
+        Take over the data for this device from a new device listing,
+        keeping the objects of the subdevices that are still listed.
+        """
+        self.data = data
+        self.invalidate()
+        self._sync_resources(data)
+
+        self._load_subdevices(dict(
+            ((subdevice.device_type(), subdevice.id), subdevice)
+            for subdevice in self.subdevices_view()
+        ))
+
+    def _load_subdevices(self, known):
+        views = {}
+        all_subdevices = []
 
         for subdevice_type in self.subdevice_types:
             subdevice_plural = "%ss" % subdevice_type.__name__
-            setattr(self, "_%s" % subdevice_plural, [])
-            setattr(self,
-                    subdevice_plural,
-                    self._subdevices_by_type_closure(subdevice_plural))
-            subdevice_list = getattr(self, "_%s" % subdevice_plural)
+            subdevice_list = []
 
             for subdevice_info in self.data[subdevice_plural]:
-                this_obj = subdevice_type(
-                    self.wink,
-                    subdevice_info)
-                self._subdevices.append(this_obj)
+                this_obj = known.get((
+                    subdevice_type.__name__,
+                    subdevice_info["%s_id" % subdevice_type.__name__],
+                ))
+
+                if this_obj is None:
+                    this_obj = subdevice_type(
+                        self.wink,
+                        subdevice_info)
+                else:
+                    this_obj._load(subdevice_info)
+
+                all_subdevices.append(this_obj)
                 subdevice_list.append(this_obj)
 
-    def _subdevices_by_type_closure(self, subdevice_type):
-        return lambda: self.subdevices_by_type(subdevice_type)
+            views[subdevice_plural] = tuple(subdevice_list)
+
+        if all_subdevices:
+            views[None] = tuple(all_subdevices)
+        self._subdevice_views = views or _no_subdevices
 
     def subdevices_by_type(self, typ):
-        return list(getattr(self, "_%s" % typ, []))
+        return list(self._subdevice_views.get(typ, ()))
 
     def subdevices(self):
-        return list(self._subdevices)
+        return list(self.subdevices_view())
+
+    def subdevices_view(self, typ=None):
+        """
+        Tuple of the subdevices, or of those of the given type (e.g.
+        "outlets"). Unlike subdevices, it is not copied on every call.
+        """
+        return self._subdevice_views.get(typ, ())
 
     def _path(self):
         return "/%ss/%s" % (self.device_type(), self.id)
@@ -100,37 +301,236 @@ class DeviceBase(object):
     def device_type(self):
         return self.__class__.__name__
 
-    def get(self):
-        return self.wink._get(self._path())
+    def _state_ttl(self):
+        if self.cache_ttl is not None:
+            return self.cache_ttl
+        if self.wink._subscription is not None:
+            # pushed updates keep the cached state current
+            return float("inf")
+        return self.wink.cache_ttl
+
+    def invalidate(self):
+        """Forget the cached state, so the next 'get' hits the server."""
+        self._state = None
+
+    def get(self, strict=False):
+        """
+        Fetch the current state of the device. A state fetched less than
+        cache_ttl seconds ago is returned without a request, unless
+        strict is set.
+        """
+        ttl = self._state_ttl()
+
+        if (not strict and ttl and self._state is not None and
+                time.monotonic() - self._state_time < ttl):
+            return self.wink._resolved(dict(self._state))
+
+        return self.wink._then(self.wink._get(self._path()), self._cache)
+
+    def _cache(self, state):
+        self._sync_resources(state)
+
+        if not self._state_ttl():
+            return state
+
+        self._state = state
+        self._state_time = time.monotonic()
+
+        # callers (e.g. get_config) may modify what they get back
+        return dict(state)
+
+    def add_listener(self, listener):
+        """
+        Call listener(device, changes) whenever a pushed update changes
+        the device, where changes maps the changed fields to their new
+        values.
+        """
+        if self._listeners is None:
+            self._listeners = []
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def _apply(self, message):
+        changes = dict(
+            (k, v) for k, v in message.items() if self.data.get(k) != v
+        )
+
+        data = dict(self.data)
+        data.update(message)
+        self.data = data
+        self._sync_resources(message)
+
+        if self._state is not None:
+            self._state.update(message)
+        else:
+            self._state = dict(self.data)
+        self._state_time = time.monotonic()
+
+        if changes and self._listeners:
+            for listener in list(self._listeners):
+                listener(self, changes)
 
     def update(self, data):
-        return self.wink._put(self._path(), data)
+        if self.wink._coalescer is not None:
+            # reads until the batch is sent must not return the old state
+            self.invalidate()
+            return self.wink._coalescer.submit(self, data)
+        return self._send_update(data)
+
+    def _send_update(self, data):
+        self.invalidate()
+        # again once sent, in case a read while the PUT was in flight
+        # cached the old state
+        return self.wink._then(
+            self.wink._put(self._path(), data),
+            self._invalidated
+        )
+
+    def _invalidated(self, result):
+        self.invalidate()
+        return result
 
-    def get_config(self, status=None):
+    def get_config(self, status=None, strict=False):
         if not status:
-            status = self.get()
+            return self.wink._then(
+                self.get(strict=strict),
+                self._strip_config
+            )
+
+        return self._strip_config(status)
 
+    def _strip_config(self, status):
         for field in self.non_config_fields:
             if field in status:
                 del status[field]
 
         return status
 
-    def revert(self):
+    def _subdevice_status(self, status, subdevice):
+        """Find the state of a subdevice in the state of this device."""
+        id_field = "%s_id" % subdevice.device_type()
+
+        for info in status.get("%ss" % subdevice.device_type(), []):
+            if str(info.get(id_field)) == str(subdevice.id):
+                return info
+
+    def _revert_changes(self, status, changes):
+        changes[self] = config_diff(
+            self._strip_config(dict(status or {})),
+            self._strip_config(dict(self._original))
+        )
+
+        for subdevice in self.subdevices_view():
+            subdevice._revert_changes(
+                self._subdevice_status(status or {}, subdevice),
+                changes
+            )
+
+    def _update_changed(self, changes, max_concurrency):
+        """
+        Concurrently send the changed fields to each device in changes,
+        skipping those without changes.
+        """
+        changed = [device for device in changes if changes[device]]
+
+        return self.wink._fan_out(
+            changed,
+            lambda device: device.update(changes[device]),
+            max_concurrency
+        )
+
+    def revert(self, max_concurrency=8):
         """
         If you break anything, run this to revert the device
         configuration to the original value from when the object
         was instantiated.
+
+        The current configuration of the device and its subdevices is
+        read with one request, and only the fields that differ from the
+        original are sent, concurrently for all devices. Returns a
+        GroupResult for each device that was updated.
         """
 
-        old_config = self.get_config(self.data)
-        self.update(old_config)
+        def revert_changed(status):
+            changes = {}
+            self._revert_changes(status, changes)
+            return self._update_changed(changes, max_concurrency)
+
+        return self.wink._then(self.get(strict=True), revert_changed)
+
+    def _resources(self, resource_cls, strict=False):
+        """
+        The resources of a type (e.g. the triggers of the device) as
+        objects of resource_cls. They are read from the device state
+        once, and from then on kept up to date by the create, update
+        and delete calls of this library, by any later 'get' of the
+        device and by pushed updates. strict reads them again.
+        """
+        field = "%ss" % resource_cls.__name__
+
+        cached = None
+        if not strict and self._collections is not None:
+            cached = self._collections.get(field)
+
+        if cached is not None:
+            return self.wink._resolved(
+                [resource_cls(self, x) for x in list(cached.values())])
+
+        def load(status):
+            self._load_resources(field, status.get(field) or [])
+            return [
+                resource_cls(self, x)
+                for x in list(self._collections[field].values())
+            ]
+
+        return self.wink._then(self.get(strict=strict), load)
+
+    def _load_resources(self, field, items):
+        id_field = "%s_id" % field[:-1]
+
+        if self._collections is None:
+            self._collections = {}
+        self._collections[field] = dict((x[id_field], x) for x in items)
+
+    def _sync_resources(self, state):
+        # only the resource types read before are cached
+        if not self._collections:
+            return
 
-        for subdevice in self.subdevices():
-            subdevice.revert()
+        for field in list(self._collections):
+            if isinstance(state.get(field), list):
+                self._load_resources(field, state[field])
+
+    def _cached_resource(self, field, resource_id):
+        if self._collections is None:
+            return None
+        return self._collections.get(field, {}).get(resource_id)
+
+    def _cache_resource(self, field, resource_id, data):
+        if self._collections is not None and field in self._collections:
+            self._collections[field][resource_id] = data
+
+    def _forget_resource(self, field, resource_id):
+        if self._collections is not None and field in self._collections:
+            self._collections[field].pop(resource_id, None)
+
+    def _create_resource(self, resource_cls, path, data):
+        def created(res):
+            resource = resource_cls(self, res)
+            resource._store(res)
+            return resource
+
+        return self.wink._then(self.wink._post(path, data), created)
+
+    def _create_resources(self, create, items, max_concurrency):
+        return self.wink._fan_out(list(items), create, max_concurrency)
 
     class trigger(CreatableResourceBase):
 
+        __slots__ = ()
+
         mutable_fields = [
             ("name", str),
             ("enabled", bool),
@@ -141,21 +541,26 @@ class DeviceBase(object):
     def _trigger_path(self):
         return "%s/triggers" % self._path()
 
-    def triggers(self):
-        return [
-            DeviceBase.trigger(self, x)
-            for x
-            in self.get().get("triggers", [])
-        ]
+    def triggers(self, strict=False):
+        return self._resources(DeviceBase.trigger, strict)
 
     def create_trigger(self, data):
-        res = self.wink._post(self._trigger_path(), data)
+        return self._create_resource(
+            DeviceBase.trigger, self._trigger_path(), data)
 
-        return DeviceBase.trigger(self, res)
+    def create_triggers(self, items, max_concurrency=8):
+        """
+        Create a trigger for each data dict in items, concurrently, and
+        return a GroupResult for each.
+        """
+        return self._create_resources(
+            self.create_trigger, items, max_concurrency)
 
 
 class powerstrip(DeviceBase, Sharable):
 
+    __slots__ = ()
+
     non_config_fields = [
         "powerstrip_id",
 
@@ -173,6 +578,8 @@ class powerstrip(DeviceBase, Sharable):
 
     class outlet(DeviceBase):
 
+        __slots__ = ()
+
         non_config_fields = [
             "outlet_id",
             "outlet_index",
@@ -186,6 +593,8 @@ class powerstrip(DeviceBase, Sharable):
 
         class scheduled_outlet_state(CreatableSubResourceBase):
 
+            __slots__ = ()
+
             mutable_fields = [
                 ("name", str),
                 ("powered", bool),
@@ -196,10 +605,24 @@ class powerstrip(DeviceBase, Sharable):
         def _schedule_path(self):
             return "%s/scheduled_outlet_states" % self._path()
 
+        def schedules(self, strict=False):
+            return self._resources(
+                powerstrip.outlet.scheduled_outlet_state, strict)
+
         def create_schedule(self, data):
-            res = self.wink._post(self._schedule_path(), data)
+            return self._create_resource(
+                powerstrip.outlet.scheduled_outlet_state,
+                self._schedule_path(),
+                data
+            )
 
-            return powerstrip.outlet.scheduled_outlet_state(self, res)
+        def create_schedules(self, items, max_concurrency=8):
+            """
+            Create a scheduled state for each data dict in items,
+            concurrently, and return a GroupResult for each.
+            """
+            return self._create_resources(
+                self.create_schedule, items, max_concurrency)
 
     subdevice_types = [
         outlet
@@ -207,11 +630,13 @@ class powerstrip(DeviceBase, Sharable):
 
 
 class eggtray(DeviceBase, Sharable):
-    pass
+    __slots__ = ()
 
 
 class cloud_clock(DeviceBase, Sharable):
 
+    __slots__ = ()
+
     non_config_fields = [
         "cloud_clock_id",
 
@@ -236,6 +661,8 @@ class cloud_clock(DeviceBase, Sharable):
     # it as a DeviceBase
     class dial(DeviceBase):
 
+        __slots__ = ()
+
         non_config_fields = [
             "dial_id",
             "dial_index",
@@ -252,77 +679,128 @@ class cloud_clock(DeviceBase, Sharable):
         ]
 
         def templates(self):
-            return self.wink._get("/dial_templates")
+            return self.wink.dial_template_catalog.items()
 
         def demo(self, delay=5):
             """
-            Generates a sequence of updates to run the dial through
-            the range of values and positions.
+            Runs the dial through the range of values and positions,
+            "delay" seconds each, and then restores its configuration.
+
+            Returns immediately with the scheduler.Sequence of updates,
+            which can be waited for, or cancelled (which also restores
+            the dial).
             """
 
-            original = self.get_config()
+            original = {}
 
-            # do some stuff
-            values = [
-                ("min", original["dial_configuration"]["min_value"]),
-                ("max", original["dial_configuration"]["max_value"]),
-            ]
+            def start():
+                original.update(self.get_config())
 
-            # set the dial to manual control
-            self.update(dict(
-                channel_configuration=dict(channel_id="10"),
-                dial_configuration=original["dial_configuration"],
-                label="demo!",
-            ))
-            time.sleep(delay)
+                # set the dial to manual control
+                self.update(dict(
+                    channel_configuration=dict(channel_id="10"),
+                    dial_configuration=original["dial_configuration"],
+                    label="demo!",
+                ))
 
-            for text, value in values:
-                self.update(dict(value=value, label="%s: %s" % (text, value)))
-                time.sleep(delay)
+            def show(text, field):
+                def step():
+                    value = original["dial_configuration"][field]
+                    self.update(dict(
+                        value=value,
+                        label="%s: %s" % (text, value),
+                    ))
 
-            # revert to the original configuration
-            self.update(original)
+                return step
+
+            def restore():
+                # revert to the original configuration
+                if original:
+                    self.update(original)
+
+            return self.wink.scheduler.sequence([
+                (0, start),
+                (delay, show("min", "min_value")),
+                (delay, show("max", "max_value")),
+                (delay, restore),
+            ], cleanup=restore)
 
         def flash_value(self, duration=5):
             """
             Temporarily replace the existing label with the current value
             for the specified duration.
-            """
 
-            original = self.get_config()
-
-            # set the dial to manual control
-            self.update(dict(
-                channel_configuration=dict(channel_id="10"),
-                dial_configuration=original["dial_configuration"],
-                label="%s" % original["value"],
-            ))
-            time.sleep(duration)
+            Returns immediately with the scheduler.Sequence of updates,
+            which can be waited for, or cancelled (which also restores
+            the label).
+            """
 
-            self.update(dict(
-                channel_configuration=original["channel_configuration"],
-                dial_configuration=original["dial_configuration"],
-                label=original["label"],
-                labels=original["labels"],
-            ))
+            state = {}
+
+            def start():
+                state.update(self.get())
+                original = self._strip_config(dict(state))
+
+                # set the dial to manual control
+                self.update(dict(
+                    channel_configuration=dict(channel_id="10"),
+                    dial_configuration=original["dial_configuration"],
+                    label="%s" % original["value"],
+                ))
+
+            def restore():
+                if state:
+                    self.update(dict(
+                        channel_configuration=state["channel_configuration"],
+                        dial_configuration=state["dial_configuration"],
+                        label=state["label"],
+                        labels=state["labels"],
+                    ))
+
+            return self.wink.scheduler.sequence([
+                (0, start),
+                (duration, restore),
+            ], cleanup=restore)
 
     subdevice_types = [
         dial,
     ]
 
-    def rotate(self, direction="left"):
-        statuses = [d.get_config() for d in self.dials()]
+    def rotate(self, direction="left", max_concurrency=8):
+        """
+        Move the configuration of each dial to its neighbor. The dials
+        are read with one request, and only the dials whose
+        configuration changes are updated, concurrently. Returns a
+        GroupResult for each updated dial.
+        """
 
-        if direction == "left":
-            statuses.append(statuses.pop(0))
-        else:
-            statuses.insert(0, statuses.pop(-1))
+        dials = self.subdevices_view("dials")
+
+        def rotate_dials(status):
+            current = [
+                d._strip_config(dict(
+                    self._subdevice_status(status, d) or d.data))
+                for d in dials
+            ]
+
+            targets = list(current)
+            if direction == "left":
+                targets.append(targets.pop(0))
+            else:
+                targets.insert(0, targets.pop(-1))
 
-        for d, new_status in zip(self.dials(), statuses):
-            d.update(new_status)
+            changes = dict(
+                (d, config_diff(c, t))
+                for d, c, t in zip(dials, current, targets)
+            )
+            return self._update_changed(changes, max_concurrency)
+
+        return self.wink._then(self.get(strict=True), rotate_dials)
 
     class alarm(CreatableResourceBase):
 
+        __slots__ = ()
+
         mutable_fields = [
             ("name", str),
             ("recurrence", str),
@@ -332,12 +810,8 @@ class cloud_clock(DeviceBase, Sharable):
     def _alarm_path(self):
         return "%s/alarms" % self._path()
 
-    def alarms(self):
-        return [
-            cloud_clock.alarm(self, x)
-            for x
-            in self.get().get("alarms", [])
-        ]
+    def alarms(self, strict=False):
+        return self._resources(cloud_clock.alarm, strict)
 
     def create_alarm(self, name, recurrence, enabled=True):
         data = dict(
@@ -345,22 +819,34 @@ class cloud_clock(DeviceBase, Sharable):
             recurrence=recurrence,
             enabled=enabled)
 
-        res = self.wink._post(self._alarm_path(), data)
+        return self._create_resource(
+            cloud_clock.alarm, self._alarm_path(), data)
 
-        return cloud_clock.alarm(self, res)
+    def create_alarms(self, items, max_concurrency=8):
+        """
+        Create an alarm for each dict of create_alarm arguments in
+        items, concurrently, and return a GroupResult for each.
+        """
+        return self._create_resources(
+            lambda kwargs: self.create_alarm(**kwargs),
+            items,
+            max_concurrency
+        )
 
 
 class piggy_bank(DeviceBase, Sharable):
-    pass
+    __slots__ = ()
     # TODO: deposits
 
 
 class sensor_pod(DeviceBase, Sharable):
-    pass
+    __slots__ = ()
 
 
 # Wink Hub
 class hub(DeviceBase, Sharable):
+    __slots__ = ()
+
     non_config_fields = [
         "created_at",
         "device_manufacturer",
@@ -385,10 +871,10 @@ class hub(DeviceBase, Sharable):
 
     def _get_last_reading(self):
         """Get the last reading of the device"""
-        state = self.get_config()
-
-        if 'last_reading' in state:
-            return state['last_reading']
+        return self.wink._then(
+            self.get_config(),
+            lambda state: state.get('last_reading')
+        )
 
     def _set_state(self, _pairing_mode=None, _kidde_radio_code=None):
         """Change the devices state"""
@@ -399,49 +885,44 @@ class hub(DeviceBase, Sharable):
         if _kidde_radio_code is not None:
             new_state['kidde_radio_code'] = _kidde_radio_code
 
-        self.update(dict(desired_state=new_state))
+        return self.update(dict(desired_state=new_state))
 
-    def is_update_needed(self):
+    @_reader
+    def is_update_needed(self, last):
         """Does the hub require an update"""
-        last = self._get_last_reading()
-
         if 'update_needed' in last:
             return last['update_needed']
 
         # if unknown, assume false
         return False
 
-    def get_mac_address(self):
+    @_reader
+    def get_mac_address(self, last):
         """Return the MAC address of the hub"""
-        last = self._get_last_reading()
-
         if 'mac_address' in last:
             return last['mac_address']
 
         return 'Unknown'
 
-    def get_ip_address(self):
+    @_reader
+    def get_ip_address(self, last):
         """Return the ip address of the hub"""
-        last = self._get_last_reading()
-
         if 'ip_address' in last:
             return last['ip_address']
 
         return 'Unknown'
 
-    def get_firmware_version(self):
+    @_reader
+    def get_firmware_version(self, last):
         """Return the firmware version of the hub"""
-        last = self._get_last_reading()
-
         if 'firmware_version' in last:
             return last['firmware_version']
 
         return 'Unknown'
 
-    def get_pairing_mode(self):
+    @_reader
+    def get_pairing_mode(self, last):
         """Return the pairing mode of the hub"""
-        last = self._get_last_reading()
-
         if 'pairing_mode' in last:
             return last['pairing_mode']
 
@@ -449,12 +930,11 @@ class hub(DeviceBase, Sharable):
 
     def set_pairing_mode(self, pairing_mode=None):
         """Set the pairing mode of the hub"""
-        self._set_state(_pairing_mode=pairing_mode)
+        return self._set_state(_pairing_mode=pairing_mode)
 
-    def get_kidde_radio_code(self):
+    @_reader
+    def get_kidde_radio_code(self, last):
         """Return the kidde radio code of the hub"""
-        last = self._get_last_reading()
-
         if 'kidde_radio_code' in last:
             return last['kidde_radio_code']
 
@@ -462,11 +942,13 @@ class hub(DeviceBase, Sharable):
 
     def set_kidde_radio_code(self, kidde_radio_code=None):
         """Return the kidde radio code of the hub"""
-        self._set_state(_kidde_radio_code=kidde_radio_code)
+        return self._set_state(_kidde_radio_code=kidde_radio_code)
 
 
 # DropCam / NestCam
 class camera(DeviceBase, Sharable):
+    __slots__ = ()
+
     non_config_fields = [
 
     ]
@@ -480,6 +962,8 @@ class camera(DeviceBase, Sharable):
 
 # MyQ Chamberlin devices
 class garage_door(DeviceBase, Sharable):
+    __slots__ = ()
+
     non_config_fields = [
         "radio_type",
         "upc_code",
@@ -506,15 +990,14 @@ class garage_door(DeviceBase, Sharable):
 
     def _get_last_reading(self):
         """Get the last reading of the device"""
-        state = self.get_config()
-
-        if 'last_reading' in state:
-            return state['last_reading']
+        return self.wink._then(
+            self.get_config(),
+            lambda state: state.get('last_reading')
+        )
 
-    def current_position(self):
+    @_reader
+    def current_position(self, last):
         """Read the current position of the door"""
-        last = self._get_last_reading()
-
         if 'position' in last:
             if last['position'] == 0.0:
                 return 'Closed'
@@ -525,10 +1008,9 @@ class garage_door(DeviceBase, Sharable):
 
         return 'Unknown'
 
-    def is_fault(self):
+    @_reader
+    def is_fault(self, last):
         """Query the device to see if there was a fault"""
-        last = self._get_last_reading()
-
         if 'fault' in last:
             return last['fault']
 
@@ -540,19 +1022,21 @@ class garage_door(DeviceBase, Sharable):
                         'position': position
                     }
 
-        self.update(dict(desired_state=new_state))
+        return self.update(dict(desired_state=new_state))
 
     def open(self):
         """Open the garage door"""
-        self._set_state(position=1.0)
+        return self._set_state(position=1.0)
 
     def close(self):
         """Close the garage door"""
-        self._set_state(position=0.0)
+        return self._set_state(position=0.0)
 
 
 # GE Link lightbulb
 class light_bulb(DeviceBase, Sharable):
+    __slots__ = ()
+
     non_config_fields = [
         "radio_type",
         "upc_code",
@@ -580,10 +1064,10 @@ class light_bulb(DeviceBase, Sharable):
 
     def _get_last_reading(self):
         """Get the last reading of the device"""
-        state = self.get_config()
-
-        if 'last_reading' in state:
-            return state['last_reading']
+        return self.wink._then(
+            self.get_config(),
+            lambda state: state.get('last_reading')
+        )
 
     def _set_state(self, brightness=None, powered=None):
         """Change the devices state"""
@@ -594,25 +1078,23 @@ class light_bulb(DeviceBase, Sharable):
         if powered is not None:
             new_state['powered'] = powered
 
-        self.update(dict(desired_state=new_state))
+        return self.update(dict(desired_state=new_state))
 
     def set_brightness(self, brightness=1.0):
         """Set the brightness of the bulb, regardless of powered state"""
-        self._set_state(brightness)
+        return self._set_state(brightness)
 
-    def is_on(self):
+    @_reader
+    def is_on(self, last):
         """Check if the bulb is powered on or not"""
-        last = self._get_last_reading()
-
         if 'powered' in last:
             return last['powered']
 
         return 'Unknown'
 
-    def get_brightness(self):
+    @_reader
+    def get_brightness(self, last):
         """Get the current brightness setting for the bulb"""
-        last = self._get_last_reading()
-
         # Artificially give a brightness of 0.0 if device
         # is powered off, since it retains last brightness
         # even if there is no power
@@ -626,18 +1108,16 @@ class light_bulb(DeviceBase, Sharable):
 
     def turn_on(self):
         """Turn the bulb on"""
-        self._set_state(powered=True)
+        return self._set_state(powered=True)
 
     def turn_off(self):
         """Turn the bulb off"""
-        self._set_state(powered=False)
+        return self._set_state(powered=False)
 
     def toggle(self):
         """Toggle the current bulb power state"""
-        state = self.is_on()
-
         # An unknown state will try to turn off
-        if state:
-            self.turn_off()
-        else:
-            self.turn_on()
+        return self.wink._then(
+            self.is_on(),
+            lambda state: self.turn_off() if state else self.turn_on()
+        )
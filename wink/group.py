@@ -0,0 +1,82 @@
+"""Send the same command to many devices at once.
+
+    w.group(w.light_bulbs()).turn_off()
+
+calls turn_off on every bulb concurrently (at most "max_concurrency" at
+a time), so the whole command takes about as long as the slowest device
+instead of the sum of all of them.
+
+The result is a list with one GroupResult per device, in the order the
+devices were given. A failing device does not stop the others; its
+exception is kept in the GroupResult instead of being raised.
+"""
+
+
+class GroupResult(object):
+    """Outcome of a group command for one device."""
+
+    def __init__(self, device, result=None, error=None):
+        self.device = device
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return "<GroupResult %s: ok>" % self._label()
+        return "<GroupResult %s: %r>" % (self._label(), self.error)
+
+    def _label(self):
+        # also used for resources (e.g. triggers), and for the data of
+        # resources to create
+        item = self.device
+        if hasattr(item, "device_type"):
+            return "%s %s" % (item.device_type(), item.id)
+        if hasattr(item, "resource_type"):
+            return "%s %s" % (item.resource_type(), item.id)
+        return repr(item)
+
+
+class DeviceGroup(object):
+    """A list of devices that commands are sent to concurrently.
+
+    Any device method can be called on the group, e.g. turn_on,
+    set_brightness or update; it returns a list of GroupResult. A name
+    that none of the devices has raises AttributeError.
+    """
+
+    def __init__(self, wink, devices, max_concurrency=8):
+        self.wink = wink
+        self.devices = list(devices)
+        self.max_concurrency = max_concurrency
+
+    def __len__(self):
+        return len(self.devices)
+
+    def __iter__(self):
+        return iter(self.devices)
+
+    def call(self, name, *args, **kwargs):
+        """Call the named method on each device."""
+        return self.wink._fan_out(
+            self.devices,
+            lambda device: getattr(device, name)(*args, **kwargs),
+            self.max_concurrency
+        )
+
+    def __getattr__(self, name):
+        # a typo should raise here, not once per device in the results;
+        # in a mixed group, devices without the method fail on their own
+        if name.startswith("_") or (self.devices and not any(
+                hasattr(cls, name)
+                for cls in set(type(device) for device in self.devices))):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+
+def failures(results):
+    """The GroupResults of a group command that raised an error."""
+    return [r for r in results if not r.ok]
@@ -3,6 +3,8 @@ import urllib.request, urllib.parse, urllib.error
 
 class Sharable(object):
 
+    __slots__ = ()
+
     read_permissions = [
         "read_data",
         "read_triggers",
@@ -0,0 +1,267 @@
+"""An in-process stand-in for the Wink servers, for benchmarks and for
+trying the library without an account.
+
+MockCloud is a transport (see the transport module) that answers
+requests itself instead of sending them:
+
+    cloud = MockCloud(sample_devices(100), latency=0.05)
+    w = Wink(dict(base_url="https://mock", client_id="id",
+                  client_secret="secret", username="user",
+                  password="password"),
+             save_auth=False, transport=cloud)
+
+It implements
+    POST /oauth2/token              password and refresh_token grants
+    GET /users/me/wink_devices      the listing, with ETags
+    GET /<type>s/<id>               a device, subdevice or resource
+    PUT /<type>s/<id>               an update, applied right away
+    POST /<type>s/<id>/<resources>  a new resource, e.g. a trigger
+    DELETE /<type>s/<id>            deletion of a resource
+
+and answers everything else with a 404. Resources of subdevices, e.g.
+the scheduled_outlet_states of an outlet, are also found under the path
+of their subdevice. A PUT merges the body into the device, and its
+desired_state into the last_reading as well, as if the device had
+carried it out.
+
+"latency" (plus a random "jitter") seconds are spent on every request,
+and a share of "error_rate" requests fail with "error_status";
+"fail_next" makes the next requests fail for certain. "counts" counts
+the requests by method and endpoint (see trace.endpoint), e.g.
+counts["PUT", "/light_bulbs/{id}"].
+"""
+
+import collections
+import copy
+import itertools
+import json
+import random
+import threading
+import time
+
+from .trace import endpoint
+from .transport import Transport
+
+
+def sample_devices(count, outlets_every=10):
+    """
+    A listing of "count" devices: light bulbs, and every
+    "outlets_every"-th a powerstrip with two outlets.
+    """
+    devices = []
+
+    for i in range(count):
+        if outlets_every and i % outlets_every == outlets_every - 1:
+            devices.append(dict(
+                object_type="powerstrip",
+                powerstrip_id=str(i),
+                name="powerstrip %d" % i,
+                outlets=[
+                    dict(object_type="outlet",
+                         outlet_id="%d-%d" % (i, j),
+                         outlet_index=j,
+                         name="outlet %d-%d" % (i, j),
+                         desired_state=dict(powered=False),
+                         last_reading=dict(powered=False))
+                    for j in range(2)
+                ],
+            ))
+        else:
+            devices.append(dict(
+                object_type="light_bulb",
+                light_bulb_id=str(i),
+                name="bulb %d" % i,
+                desired_state=dict(powered=False, brightness=1.0),
+                last_reading=dict(connection=True, powered=False,
+                                  brightness=1.0),
+            ))
+
+    return devices
+
+
+def _json(status, data, headers=None):
+    resp = {"status": status, "content-type": "application/json"}
+    resp.update(headers or {})
+    return resp, json.dumps(data).encode("utf-8")
+
+
+class MockCloud(Transport):
+    """Transport serving a fake Wink account from memory. Safe to use
+    from many threads at once.
+    """
+
+    def __init__(self, devices=(), latency=0, jitter=0, error_rate=0,
+                 error_status="503", expires_in=900, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.expires_in = expires_in
+
+        self.counts = collections.Counter()
+
+        self._random = random.Random(seed)
+        self._tokens = itertools.count(1)
+        self._ids = itertools.count(1000)
+        self._failures = []
+        self._lock = threading.Lock()
+
+        self.load(devices)
+
+    def load(self, devices):
+        """Replace the devices of the account."""
+        with self._lock:
+            self._devices = copy.deepcopy(list(devices))
+            self._by_key = {}
+            # key -> the list holding the object, for DELETE
+            self._owners = {}
+            self._version = 0
+
+            for device in self._devices:
+                self._index(device)
+
+    def _index(self, device, device_type=None, owner=None):
+        # subdevices and resources, e.g. the "outlets" of a powerstrip,
+        # are found under their plural
+        device_type = device.get("object_type", device_type)
+        key = "%s_id" % device_type
+        if key in device:
+            self._by_key[device_type, device[key]] = device
+            self._owners[device_type, device[key]] = owner
+
+        for k, v in device.items():
+            if isinstance(v, list) and k.endswith("s"):
+                for x in v:
+                    if isinstance(x, dict):
+                        self._index(x, k[:-1], v)
+
+    def fail_next(self, count=1, status="503"):
+        """Fail the next "count" requests with "status"."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _injected_error(self):
+        with self._lock:
+            if self._failures:
+                return self._failures.pop(0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self.error_status
+
+    def request(self, url, method="GET", headers=None, body=None):
+        path = "/" + url.split("://", 1)[-1].split("/", 1)[-1]
+        path = path.split("?", 1)[0]
+        parts = path.strip("/").split("/")
+
+        with self._lock:
+            self.counts[method, endpoint(path)] += 1
+
+        self._delay()
+
+        status = self._injected_error()
+        if status is not None:
+            # "error" is what the token endpoint answers with
+            return _json(status, dict(error="injected error",
+                                      errors=["injected error"]))
+
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        body = json.loads(body) if body else {}
+
+        if path == "/oauth2/token" and method == "POST":
+            return self._token(body)
+
+        if not (headers or {}).get("Authorization", "").startswith(
+                "Bearer "):
+            return _json("401", dict(errors=["not authorized"]))
+
+        if path == "/users/me/wink_devices" and method == "GET":
+            return self._listing(headers)
+
+        if len(parts) == 3 and method == "POST":
+            with self._lock:
+                device = self._by_key.get((parts[0][:-1], parts[1]))
+                if device is not None:
+                    return _json("201", dict(
+                        data=self._create(device, parts[2], body)))
+
+        if len(parts) in (2, 4) and parts[-2].endswith("s"):
+            key = (parts[-2][:-1], parts[-1])
+
+            with self._lock:
+                device = self._by_key.get(key)
+
+                if device is not None and method == "GET":
+                    return _json("200", dict(data=device))
+
+                if device is not None and method == "PUT":
+                    self._update(device, body)
+                    return _json("200", dict(data=device))
+
+                if device is not None and method == "DELETE":
+                    self._delete(key)
+                    return {"status": "204"}, b""
+
+        return _json("404", dict(errors=["%s %s not found" % (method, path)]))
+
+    def _token(self, body):
+        if body.get("grant_type") not in ("password", "refresh_token"):
+            return _json("400", dict(error="unsupported grant_type"))
+
+        with self._lock:
+            n = next(self._tokens)
+
+        return _json("201", dict(data=dict(
+            access_token="access-%d" % n,
+            refresh_token="refresh-%d" % n,
+            expires_in=self.expires_in,
+        )))
+
+    def _listing(self, headers):
+        with self._lock:
+            etag = '"%d"' % self._version
+
+            if headers.get("If-None-Match") == etag:
+                return {"status": "304", "etag": etag}, b""
+
+            return _json("200", dict(data=self._devices), dict(etag=etag))
+
+    def _create(self, device, field, data):
+        resource = dict(data)
+        resource["%s_id" % field[:-1]] = str(next(self._ids))
+
+        resources = device.setdefault(field, [])
+        resources.append(resource)
+        self._index(resource, field[:-1], resources)
+
+        self._version += 1
+        return resource
+
+    def _delete(self, key):
+        owner = self._owners.pop(key, None)
+        resource = self._by_key.pop(key)
+
+        if owner is not None:
+            owner[:] = [x for x in owner if x is not resource]
+
+        self._version += 1
+
+    def _update(self, device, data):
+        for k, v in data.items():
+            if isinstance(v, dict) and isinstance(device.get(k), dict):
+                device[k].update(v)
+            else:
+                device[k] = v
+
+        if isinstance(data.get("desired_state"), dict):
+            device.setdefault("last_reading", {}).update(
+                data["desired_state"])
+
+        self._version += 1
@@ -1,4 +1,8 @@
 from configparser import ConfigParser
+import gzip
+import json
+import os
+import tempfile
 
 
 class PersistInterface(object):
@@ -32,3 +36,38 @@ class ConfigFile(PersistInterface):
             cp.set("auth", k, v)
         with open(self.filename, "wb") as f:
             cp.write(f)
+
+
+class SnapshotFile(PersistInterface):
+    """Use a gzip-compressed JSON file to persist the device listing,
+    along with the time it was saved and its ETag, for a quick start of
+    the Wink class (its "snapshot" argument).
+
+    The file is replaced atomically, so a crash while saving never
+    leaves a truncated snapshot behind. An unreadable snapshot loads as
+    empty.
+    """
+
+    def __init__(self, filename="devices.snapshot"):
+        self.filename = filename
+
+    def load(self):
+        try:
+            with gzip.open(self.filename, "rb") as f:
+                return json.loads(f.read().decode("utf-8"))
+        except (IOError, OSError, EOFError, ValueError):
+            return {}
+
+    def save(self, data):
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                    f.write(json.dumps(
+                        data, separators=(",", ":")).encode("utf-8"))
+            os.replace(temp_name, self.filename)
+        except:
+            os.unlink(temp_name)
+            raise
@@ -0,0 +1,179 @@
+"""Adaptive polling for accounts without a push channel.
+
+    p = Poller(w, rate=2)
+    p.add_listener(lambda device, changes: print(device.id, changes))
+    p.start()
+
+polls every device of "w" with DeviceBase.get. A device whose
+last_reading changed is polled again after "min_interval" seconds; each
+poll without changes doubles (by "backoff") its interval, up to
+"max_interval". All polls together are limited to "rate" per second.
+Devices added to "w" later (e.g. by populate_devices) are polled as
+well, and removed ones are no longer polled.
+
+Listeners are called with the device and the last_reading fields that
+changed, mapped to their new values. Timestamps that change with every
+reading (fields ending in "_updated_at" or "_changed_at") are ignored.
+
+The poller works with the blocking Wink client.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from .throttle import TokenBucket
+
+
+class Poller(object):
+    """Polls devices at adaptive intervals, under a global rate limit."""
+
+    ignored_suffixes = ("_updated_at", "_changed_at")
+
+    def __init__(self, wink, devices=None, min_interval=5, max_interval=300,
+                 backoff=2.0, rate=1.0, burst=None):
+        """
+        Polls the given devices, by default the top-level devices of
+        "wink" (subdevices are part of the state of their parent), kept
+        in sync with its device list.
+        """
+        self.wink = wink
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.bucket = TokenBucket(rate, burst)
+
+        self._listeners = []
+        self._intervals = {}
+        self._heap = []
+        self._order = itertools.count()
+
+        self._thread = None
+        self._stop = threading.Event()
+
+        # the devices_view of wink last synced with, if following it
+        self._view = None
+
+        if devices is None:
+            self._view = devices = wink.devices_view()
+
+        now = time.monotonic()
+        for device in devices:
+            self._schedule(device, min_interval, now)
+
+    def add_listener(self, listener):
+        """Call listener(device, changes) when a poll finds changes."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def _schedule(self, device, interval, now):
+        self._intervals[device] = interval
+        heapq.heappush(
+            self._heap, (now + interval, next(self._order), device))
+
+    def _sync(self):
+        # devices_view returns the same tuple until the devices change
+        view = self.wink.devices_view()
+        if view is self._view:
+            return
+
+        self._view = view
+        current = set(view)
+
+        # removed devices are skipped when their turn comes
+        for device in list(self._intervals):
+            if device not in current:
+                del self._intervals[device]
+
+        now = time.monotonic()
+        for device in view:
+            if device not in self._intervals:
+                self._schedule(device, self.min_interval, now)
+
+    def _changes(self, old, new):
+        old = old or {}
+        new = new or {}
+
+        return dict(
+            (k, v) for k, v in new.items()
+            if not k.endswith(self.ignored_suffixes) and old.get(k) != v
+        )
+
+    def poll(self, device):
+        """Poll a device now, and return the changed fields."""
+        old = device.data.get("last_reading")
+
+        self.bucket.acquire()
+        state = device.get(strict=True)
+
+        changes = self._changes(old, state.get("last_reading"))
+        device._apply(state)
+
+        if changes:
+            for listener in list(self._listeners):
+                listener(device, changes)
+
+        return changes
+
+    def poll_due(self):
+        """
+        Poll the devices that are due, and return the number of seconds
+        until the next one is.
+        """
+        if self._view is not None:
+            self._sync()
+
+        while self._heap and not self._stop.is_set():
+            due, _, device = self._heap[0]
+            if due > time.monotonic():
+                break
+
+            heapq.heappop(self._heap)
+            interval = self._intervals.get(device)
+            if interval is None:
+                continue
+
+            try:
+                changed = self.poll(device)
+            except Exception as e:
+                if self.wink.debug:
+                    print("Polling %s %s failed:" % (
+                        device.device_type(), device.id), e)
+                changed = False
+
+            if changed:
+                interval = self.min_interval
+            else:
+                interval = min(interval * self.backoff, self.max_interval)
+
+            self._schedule(device, interval, time.monotonic())
+
+        if not self._heap:
+            return self.max_interval
+
+        return max(self._heap[0][0] - time.monotonic(), 0)
+
+    def run(self):
+        """Poll until "stop" is called."""
+        while not self._stop.is_set():
+            self._stop.wait(self.poll_due())
+
+    def start(self):
+        """Poll in a background thread."""
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="wink-poller")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,163 @@
+"""Many Wink accounts in one process.
+
+A WinkPool hosts one Wink client per account, all sending their
+requests through one transport, so the accounts share a pool of
+keep-alive connections and a single rate limit:
+
+    pool = WinkPool(rate_limit=10, max_accounts=500)
+    pool.add("alice", persist.ConfigFile("alice.cfg"))
+    pool.add("bob", persist.ConfigFile("bob.cfg"))
+
+    pool["alice"].light_bulbs()
+
+Each account keeps its own credentials in its persist object, which is
+also where refreshed tokens are saved. The client of an account is
+created on first access, and reads its devices on first use of them.
+
+At most "max_accounts" clients are kept in memory; when there are
+more, the least recently used ones are closed and dropped, as are the
+clients not used for "idle_timeout" seconds. An evicted account stays
+registered, and gets a new client on its next access. Only accesses
+through the pool count as use, so look clients up in the pool rather
+than holding on to them.
+"""
+
+import collections
+import threading
+import time
+
+from .api import Wink
+from .throttle import ThrottledTransport
+from .transport import HttpPool, SharedTransport
+
+
+class WinkPool(object):
+    """Wink clients for many accounts, sharing one transport.
+
+    "transport" is the transport shared by all accounts, by default a
+    pool of "pool_size" connections sending at most "rate_limit"
+    requests per second, with up to "retries" retries (see
+    throttle.ThrottledTransport). Other keyword arguments are passed to
+    the Wink constructor of every account, e.g. cache_ttl.
+    """
+
+    def __init__(self, transport=None, pool_size=16, rate_limit=None,
+                 retries=3, max_accounts=1000, idle_timeout=None,
+                 **options):
+        if transport is None:
+            transport = ThrottledTransport(
+                HttpPool(pool_size), rate=rate_limit, retries=retries,
+                tracer=options.get("tracer"))
+        self.transport = transport
+
+        self.max_accounts = max_accounts
+        self.idle_timeout = idle_timeout
+        self.options = options
+
+        # name -> (auth_object, snapshot)
+        self._accounts = {}
+        # name -> [Wink, last use], least recently used first
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, name, auth_object, snapshot=None):
+        """
+        Register an account under "name". "auth_object" is the persist
+        object holding its credentials, and "snapshot" an optional
+        persist.SnapshotFile for its device listing.
+        """
+        with self._lock:
+            if name in self._accounts:
+                raise RuntimeError("account %s already exists" % name)
+            self._accounts[name] = (auth_object, snapshot)
+
+    def remove(self, name):
+        """Unregister an account, and close its client."""
+        with self._lock:
+            del self._accounts[name]
+            entry = self._clients.pop(name, None)
+
+        if entry is not None:
+            entry[0].close()
+
+    def get(self, name):
+        """The Wink client of an account, created if needed."""
+        now = time.monotonic()
+        evicted = []
+
+        with self._lock:
+            entry = self._clients.get(name)
+
+            if entry is None:
+                auth_object, snapshot = self._accounts[name]
+                entry = self._clients[name] = [
+                    self._client(auth_object, snapshot), now]
+            else:
+                self._clients.move_to_end(name)
+                entry[1] = now
+
+            evicted = self._evict(now)
+
+        for client in evicted:
+            client.close()
+
+        return entry[0]
+
+    __getitem__ = get
+
+    def _client(self, auth_object, snapshot):
+        return Wink(auth_object, transport=SharedTransport(self.transport),
+                    lazy=True, snapshot=snapshot, **self.options)
+
+    def _evict(self, now):
+        # drop the idle clients and those over the limit, oldest first;
+        # they are closed outside of the lock
+        evicted = []
+
+        while self._clients:
+            name, (client, last_use) = next(iter(self._clients.items()))
+
+            if len(self._clients) <= self.max_accounts and (
+                    self.idle_timeout is None or
+                    now - last_use < self.idle_timeout):
+                break
+
+            del self._clients[name]
+            evicted.append(client)
+
+        return evicted
+
+    def evict_idle(self):
+        """Close the clients not used for "idle_timeout" seconds."""
+        with self._lock:
+            evicted = self._evict(time.monotonic())
+
+        for client in evicted:
+            client.close()
+
+    def accounts(self):
+        """The names of all registered accounts."""
+        with self._lock:
+            return list(self._accounts)
+
+    def loaded(self):
+        """The names of the accounts whose clients are in memory."""
+        with self._lock:
+            return list(self._clients)
+
+    def __contains__(self, name):
+        return name in self._accounts
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def close(self):
+        """Close all clients and the shared transport."""
+        with self._lock:
+            clients = [entry[0] for entry in self._clients.values()]
+            self._clients.clear()
+
+        for client in clients:
+            client.close()
+
+        self.transport.close()
@@ -0,0 +1,191 @@
+"""Recording of the requests to the Wink servers, and replaying them.
+
+RecordingTransport passes requests on to another transport and writes
+every exchange to a JSONL file as it happens, one JSON object per line:
+
+    w = Wink(persist.ConfigFile(),
+             transport=RecordingTransport("traffic.jsonl"))
+
+Each line has the "method" and "path" of the request, its "headers"
+and "body", the "status", "response_headers" and "response" of the
+answer, the "time" it was sent (in seconds since the recording started)
+and the "seconds" it took. Bodies that are JSON are stored decoded,
+others as text under "body_text" and "response_text". Secrets are left
+out: the Authorization and cookie headers are dropped, and the values
+of "secret_fields" (passwords, client secrets and tokens) are replaced
+by "REDACTED" wherever they appear in a body.
+
+ReplayTransport answers requests from such a file instead of sending
+them, e.g. for load tests or tests that must not depend on the
+network:
+
+    w = Wink(auth, save_auth=False,
+             transport=ReplayTransport("traffic.jsonl"))
+
+A request gets the recorded answers to the same method and path, in the
+order they were recorded, starting over after the last one. Requests
+that were never recorded get a 404. By default the answers come at full
+speed; with "speed", each takes its recorded time divided by "speed".
+The recording can also be replayed against wink.mock.MockCloud with
+benchmarks/suite.py --replay.
+"""
+
+import collections
+import json
+import threading
+import time
+import urllib.parse
+
+from .throttle import ThrottledTransport
+from .transport import HttpPool, Transport
+
+secret_headers = set(["authorization", "cookie", "set-cookie"])
+
+secret_fields = set([
+    "password",
+    "client_secret",
+    "access_token",
+    "refresh_token",
+])
+
+
+def _redact(value):
+    if isinstance(value, dict):
+        return dict(
+            (k, "REDACTED" if k in secret_fields else _redact(v))
+            for k, v in value.items()
+        )
+    if isinstance(value, list):
+        return [_redact(x) for x in value]
+    return value
+
+
+def _path(url):
+    parts = urllib.parse.urlsplit(url)
+    if parts.query:
+        return "%s?%s" % (parts.path, parts.query)
+    return parts.path
+
+
+def _body(record, key, body):
+    # store JSON decoded, so the recording is readable and redactable
+    if not body:
+        return
+
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+
+    try:
+        record[key] = _redact(json.loads(body))
+    except ValueError:
+        record["%s_text" % key] = body
+
+
+class RecordingTransport(Transport):
+    """Wraps a transport, writing each exchange to "filename" (or to an
+    open text file) as a line of JSON.
+
+    The default transport is the one the Wink class uses by default.
+    """
+
+    def __init__(self, filename, transport=None):
+        if transport is None:
+            transport = ThrottledTransport(HttpPool())
+        self.transport = transport
+
+        if hasattr(filename, "write"):
+            self._file = filename
+            self._owns_file = False
+        else:
+            self._file = open(filename, "a")
+            self._owns_file = True
+
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def request(self, url, method="GET", headers=None, body=None):
+        sent = time.monotonic()
+        resp, content = self.transport.request(
+            url, method, headers=headers, body=body)
+        seconds = time.monotonic() - sent
+
+        record = dict(
+            time=round(sent - self._start, 6),
+            seconds=round(seconds, 6),
+            method=method,
+            path=_path(url),
+            headers=dict(
+                (k, v) for k, v in (headers or {}).items()
+                if k.lower() not in secret_headers
+            ),
+            status=resp["status"],
+            response_headers=dict(
+                (k, v) for k, v in resp.items()
+                if k != "status" and k.lower() not in secret_headers
+            ),
+        )
+        _body(record, "body", body)
+        _body(record, "response", content)
+
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+        return resp, content
+
+    def close(self):
+        with self._lock:
+            if self._owns_file:
+                self._file.close()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Answers requests with the exchanges recorded in "filename" by a
+    RecordingTransport. Safe to use from many threads at once.
+    """
+
+    def __init__(self, filename, speed=None):
+        self.speed = speed
+
+        # (method, path) -> [(response, content, seconds)]
+        self._answers = collections.defaultdict(list)
+        self._next = collections.Counter()
+        self._lock = threading.Lock()
+
+        with open(filename) as f:
+            for line in f:
+                if line.strip():
+                    self._add(json.loads(line))
+
+    def _add(self, record):
+        resp = dict(record.get("response_headers") or {})
+        resp["status"] = record["status"]
+
+        if "response" in record:
+            content = json.dumps(record["response"]).encode("utf-8")
+        else:
+            content = record.get("response_text", "").encode("utf-8")
+
+        self._answers[record["method"], record["path"]].append(
+            (resp, content, record.get("seconds", 0)))
+
+    def request(self, url, method="GET", headers=None, body=None):
+        key = (method, _path(url))
+        answers = self._answers.get(key)
+
+        if not answers:
+            return {"status": "404"}, json.dumps(dict(
+                errors=["%s %s was not recorded" % key])).encode("utf-8")
+
+        with self._lock:
+            i = self._next[key]
+            self._next[key] = (i + 1) % len(answers)
+
+        resp, content, seconds = answers[i]
+
+        if self.speed:
+            time.sleep(seconds / self.speed)
+
+        return dict(resp), content
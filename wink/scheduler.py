@@ -0,0 +1,246 @@
+"""Timed actions without blocking the caller.
+
+A Scheduler runs actions at their due time from a single background
+thread, ordered by a heap, so any number of timed sequences (e.g. dial
+animations) can run at once without a thread each. Actions run one at
+a time on that thread, so they should be short, e.g. a single update.
+
+    seq = w.scheduler.sequence([
+        (0, lambda: dial.update(dict(label="hello"))),
+        (5, lambda: dial.update(dict(label="world"))),
+    ])
+    seq.wait()
+
+Each step of a sequence runs the given number of seconds after the
+previous step finished.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger("wink")
+
+
+class Action(object):
+    """Handle of a scheduled action."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler(object):
+    """Runs actions at their due time from one background thread, which
+    is started on first use.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._order = itertools.count()
+        self._cv = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        # sequences that have not finished yet, cancelled on stop
+        self._sequences = set()
+
+    def call_later(self, delay, fn):
+        """Call fn after delay seconds, and return its Action."""
+        action = Action(fn)
+
+        with self._cv:
+            heapq.heappush(
+                self._heap,
+                (time.monotonic() + delay, next(self._order), action))
+
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run,
+                                                name="wink-scheduler")
+                self._thread.daemon = True
+                self._thread.start()
+
+            self._cv.notify()
+
+        return action
+
+    def sequence(self, steps, cleanup=None):
+        """
+        Run a list of (delay, fn) steps one after another, and return
+        the Sequence handle. "cleanup" is called when the sequence is
+        cancelled or a step fails after it started, e.g. to restore the
+        state from before.
+        """
+        sequence = Sequence(self, steps, cleanup)
+
+        with self._cv:
+            if not sequence.done():
+                self._sequences.add(sequence)
+
+        return sequence
+
+    def _forget(self, sequence):
+        with self._cv:
+            self._sequences.discard(sequence)
+
+    def _next_action(self):
+        with self._cv:
+            while not self._stopped:
+                if not self._heap:
+                    self._cv.wait()
+                    continue
+
+                delay = self._heap[0][0] - time.monotonic()
+                if delay <= 0:
+                    return heapq.heappop(self._heap)[2]
+
+                self._cv.wait(delay)
+
+    def _run(self):
+        while True:
+            action = self._next_action()
+            if action is None:
+                return
+
+            if action.cancelled:
+                continue
+
+            try:
+                action.fn()
+            except Exception:
+                logger.debug("Scheduled action failed", exc_info=True)
+
+    def stop(self):
+        """
+        Stop the background thread; pending actions are dropped, and
+        unfinished sequences are cancelled, running their cleanup on the
+        calling thread.
+        """
+        with self._cv:
+            thread = self._thread
+            self._thread = None
+            self._stopped = True
+            del self._heap[:]
+            sequences = list(self._sequences)
+            self._sequences.clear()
+            self._cv.notify()
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+        for sequence in sequences:
+            sequence._abort()
+
+
+class Sequence(object):
+    """Handle of a running sequence of scheduled steps.
+
+    "exception" holds the error of the step that failed, if any.
+    """
+
+    def __init__(self, scheduler, steps, cleanup=None):
+        self.scheduler = scheduler
+        self.exception = None
+
+        self._steps = list(steps)
+        self._cleanup = cleanup
+        self._index = 0
+        self._started = False
+        self._cancelled = False
+        self._action = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+        self._schedule_next()
+
+    def _schedule_next(self):
+        with self._lock:
+            if self._cancelled:
+                return
+
+            if self._index == len(self._steps):
+                self._done.set()
+                self.scheduler._forget(self)
+                return
+
+            delay, fn = self._steps[self._index]
+            self._index += 1
+
+            self._action = self.scheduler.call_later(
+                delay, lambda: self._run_step(fn))
+
+    def _run_step(self, fn):
+        if self._cancelled:
+            return
+
+        self._started = True
+
+        try:
+            fn()
+        except Exception as e:
+            self.exception = e
+            self._finish()
+            return
+
+        self._schedule_next()
+
+    def _finish(self):
+        try:
+            if self._started and self._cleanup is not None:
+                self._cleanup()
+        finally:
+            self._done.set()
+            self.scheduler._forget(self)
+
+    def cancel(self):
+        """
+        Stop the sequence before its next step, and run the cleanup.
+        Returns False if it had already finished.
+        """
+        with self._lock:
+            if self._cancelled or self._done.is_set():
+                return False
+
+            self._cancelled = True
+            if self._action is not None:
+                self._action.cancel()
+
+        # after the step that may be running right now
+        self.scheduler.call_later(0, self._finish)
+        return True
+
+    def _abort(self):
+        # the scheduler stopped, so the steps and the pending cleanup of
+        # a cancel will not run; cancel and clean up right here
+        with self._lock:
+            if self._done.is_set():
+                return
+
+            self._cancelled = True
+            if self._action is not None:
+                self._action.cancel()
+
+        self._finish()
+
+    def cancelled(self):
+        return self._cancelled
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wait until the sequence has finished, and return whether it
+        has. Raises the error of a failed step.
+        """
+        finished = self._done.wait(timeout)
+
+        if self.exception is not None:
+            raise self.exception
+
+        return finished
@@ -0,0 +1,126 @@
+"""Incremental parsing of large JSON responses.
+
+The Wink servers answer with an object whose "data" field holds the
+payload, e.g. the list of devices. "iter_items" parses such a response
+from an iterable of byte chunks (see Transport.stream) and yields the
+items of that list as soon as each one is complete, so only one item
+and one chunk are held in memory at a time, rather than the whole
+response and its decoded form.
+"""
+
+import codecs
+import json
+
+_whitespace = " \t\n\r"
+# characters that can go on a number, e.g. "12" in "12.5e3"
+_number_chars = "0123456789.eE+-"
+
+
+class _Reader(object):
+    # a window over the decoded text, refilled from the chunks on demand
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        if self.eof:
+            raise ValueError("unexpected end of JSON response")
+
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self.decoder.decode(b"", True)
+        else:
+            text = self.decoder.decode(chunk)
+
+        # drop what was parsed already
+        self.text = self.text[self.pos:] + text
+        self.pos = 0
+
+    def peek(self):
+        """The next character that is not whitespace."""
+        while True:
+            while (self.pos < len(self.text) and
+                   self.text[self.pos] in _whitespace):
+                self.pos += 1
+
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+
+            self.more()
+
+    def expect(self, chars):
+        c = self.peek()
+        if c not in chars:
+            raise ValueError("expected one of %r in JSON response, got %r" %
+                             (chars, c))
+        self.pos += 1
+        return c
+
+    def value(self, decoder):
+        self.peek()
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                value, end = None, None
+
+            # a number at the end of the text may go on in the next
+            # chunk, also when only a prefix of it ("12." or "12.5e") is
+            # there, which decodes to a shorter number
+            if end is not None and (self.eof or not (
+                    end == len(self.text) or
+                    (self._is_number(value) and
+                     self.text[end] in _number_chars))):
+                self.pos = end
+                return value
+
+            self.more()
+
+    @staticmethod
+    def _is_number(value):
+        return (isinstance(value, (int, float)) and
+                not isinstance(value, bool))
+
+
+def iter_items(chunks, field="data", rest=None, decoder=None):
+    """
+    Yield the items of the list in "field" of the JSON object read from
+    "chunks". The other fields of the object (e.g. "pagination") are
+    stored in the "rest" dict, if given, once the generator is done.
+
+    Raises ValueError for malformed JSON.
+    """
+    decoder = decoder or json.JSONDecoder()
+    reader = _Reader(chunks)
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value(decoder)
+        reader.expect(":")
+
+        if key == field and reader.peek() == "[":
+            reader.expect("[")
+
+            if reader.peek() != "]":
+                while True:
+                    yield reader.value(decoder)
+                    if reader.expect(",]") == "]":
+                        break
+            else:
+                reader.expect("]")
+        else:
+            value = reader.value(decoder)
+            if rest is not None:
+                rest[key] = value
+
+        if reader.expect(",}") == "}":
+            return
@@ -0,0 +1,77 @@
+"""Push channels that deliver device state changes to a Wink object,
+as an alternative to polling DeviceBase.get.
+
+A subscription is handed to Wink.subscribe, which starts it with a
+callback. The subscription calls it with every state message it
+receives; a message is the JSON of a device, as returned by a device
+'get' (optionally wrapped in {"data": ...}), either decoded or as a
+string. Wink applies it to the matching device object and notifies the
+listeners of that device.
+"""
+
+import logging
+import queue
+import threading
+
+logger = logging.getLogger("wink")
+
+
+class SubscriptionInterface(object):
+    """
+    Subscription classes should implement this interface.
+    """
+
+    def start(self, deliver):
+        pass
+
+    def stop(self):
+        pass
+
+
+class LocalSubscription(SubscriptionInterface):
+    """In-process push channel, e.g. for testing, or for bridging a push
+    service that is connected to elsewhere in the application.
+
+    Messages passed to "publish" are delivered from a background thread,
+    like they would be from a network connection; "wait" blocks until
+    all published messages are delivered.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._deliver = None
+
+    def start(self, deliver):
+        self._deliver = deliver
+        self._thread = threading.Thread(target=self._run,
+                                        name="wink-subscription")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def publish(self, message):
+        self._queue.put(message)
+
+    def wait(self):
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            message = self._queue.get()
+            try:
+                if message is None:
+                    return
+                self._deliver(message)
+            except Exception:
+                logger.debug("Failed to deliver pushed message",
+                             exc_info=True)
+            finally:
+                self._queue.task_done()
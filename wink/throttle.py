@@ -0,0 +1,179 @@
+"""Rate limiting for requests to the Wink servers."""
+
+import datetime
+import email.utils
+import random
+import threading
+import time
+
+import httplib2
+
+from .transport import Transport
+
+
+class TokenBucket(object):
+    """Allow "rate" operations per second on average, in bursts of up to
+    "capacity" operations. Safe to share between threads.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1))
+
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        # take a token if there is one, otherwise tell how long until
+        # the next one is available
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+
+            return (1 - self._tokens) / self.rate
+
+    def try_acquire(self):
+        """Take a token if one is available, without waiting."""
+        return self._reserve() == 0
+
+    def acquire(self):
+        """Wait for a token, and return the number of seconds waited."""
+        waited = 0
+        while True:
+            delay = self._reserve()
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
+class ThrottledTransport(Transport):
+    """Wraps a transport with a rate limit and retries.
+
+    At most "rate" requests per second are sent on average (no limit if
+    None). Requests that fail with a connection error or one of
+    "retry_statuses" are retried up to "retries" times, after an
+    exponential backoff with jitter, or after the delay in the
+    Retry-After header of the response if there is one. A response
+    asking to wait longer than "max_backoff" seconds is returned instead
+    of retried. Requests that are not idempotent (POST) are only retried
+    after a 429, which means the request was not processed.
+
+    "throttled" counts the requests that waited for the rate limit or
+    got a 429, and "retried" counts the retries. Both are also counted
+    by "tracer", if given (see the trace module).
+    """
+
+    retry_statuses = set(["429", "500", "502", "503", "504"])
+    idempotent_methods = set(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+
+    def __init__(self, transport, rate=None, burst=None, retries=3,
+                 backoff=0.5, max_backoff=30, tracer=None):
+        self.transport = transport
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.tracer = tracer
+
+        self.throttled = 0
+        self.retried = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+        if self.tracer is not None:
+            self.tracer.count(counter)
+
+    def _delay(self, attempt):
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _should_retry(self, method, status):
+        if status not in self.retry_statuses:
+            return False
+        return status == "429" or method in self.idempotent_methods
+
+    def request(self, url, method="GET", headers=None, body=None):
+        return self._send(self.transport.request, url, method, headers,
+                          body)
+
+    def stream(self, url, method="GET", headers=None, body=None):
+        # retried like any request, as the body is not read before the
+        # status is known
+        return self._send(self.transport.stream, url, method, headers,
+                          body)
+
+    def _send(self, send, url, method, headers, body):
+        attempt = 0
+
+        while True:
+            if self.bucket is not None and self.bucket.acquire():
+                self._count("throttled")
+
+            try:
+                resp, content = send(url, method, headers=headers,
+                                     body=body)
+            except (OSError, httplib2.HttpLib2Error):
+                # the server may have processed the request already
+                if (attempt >= self.retries or
+                        method not in self.idempotent_methods):
+                    raise
+                delay = self._delay(attempt)
+            else:
+                if resp["status"] == "429":
+                    self._count("throttled")
+
+                if (attempt >= self.retries or
+                        not self._should_retry(method, resp["status"])):
+                    return resp, content
+
+                delay = _retry_after(resp)
+                if delay is None:
+                    delay = self._delay(attempt)
+                elif delay > self.max_backoff:
+                    # don't block the caller for as long as the server
+                    # asks, e.g. an hour
+                    return resp, content
+
+                # release the connection of a streamed body that is
+                # dropped for the retry
+                if hasattr(content, "close"):
+                    content.close()
+
+            attempt += 1
+            self._count("retried")
+            time.sleep(delay)
+
+    def close(self):
+        self.transport.close()
+
+
+def _retry_after(resp):
+    """The delay requested by a Retry-After header, in seconds."""
+    value = resp.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((when - datetime.datetime.now(when.tzinfo)).total_seconds(), 0)
@@ -0,0 +1,229 @@
+"""Request tracing for the Wink class.
+
+With Wink(tracer=Tracer()), every API request and every token refresh
+is measured: latency histograms and request counts per endpoint, bytes
+sent and received, and counters for token refreshes, retries and
+throttled requests (of the default transport). Without a tracer none of
+this is done.
+
+Endpoints are the request paths with their ids left out, e.g.
+"/light_bulbs/{id}". The collected data can be read from the Tracer,
+rendered in the Prometheus text format by "prometheus_text", or handed
+to exporters as it is collected. An exporter is any callable taking an
+event dict, e.g.
+
+    Tracer(exporters=[LoggingExporter(), my_callback])
+
+Request events have the keys "kind" ("request"), "method", "path",
+"endpoint", "status" (None if the request failed without a response),
+"seconds", "bytes_sent", "bytes_received" and "error"; token refreshes
+are "auth" and "reauth" events with "seconds" and "error", and other
+counters are events of their own kind, e.g. "retried".
+"""
+
+import bisect
+import collections
+import logging
+import threading
+
+default_buckets = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+
+def endpoint(path):
+    """
+    The path with ids left out: the segments containing a digit, other
+    than the first one (e.g. "oauth2").
+    """
+    return "/".join(
+        "{id}" if i > 1 and any(c.isdigit() for c in segment) else segment
+        for i, segment in enumerate(path.split("?", 1)[0].split("/"))
+    )
+
+
+class Histogram(object):
+    """Counts of observed values by upper bound, plus their sum."""
+
+    def __init__(self, buckets=default_buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, count of values up to it) pairs, as in
+        Prometheus; the last bound is "+Inf".
+        """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Tracer(object):
+    """Collects the measurements of one or more Wink clients.
+
+    "latency" maps (method, endpoint) to a Histogram of seconds,
+    "requests" counts the requests by (method, endpoint, status),
+    "bytes_sent" and "bytes_received" count bytes by (method, endpoint),
+    and "counters" counts the other events by kind.
+    """
+
+    def __init__(self, exporters=(), buckets=default_buckets):
+        self.exporters = list(exporters)
+        self.buckets = buckets
+
+        self.latency = {}
+        self.requests = collections.Counter()
+        self.bytes_sent = collections.Counter()
+        self.bytes_received = collections.Counter()
+        self.counters = collections.Counter()
+
+        # path -> endpoint, as there are few distinct paths
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _export(self, event):
+        for exporter in self.exporters:
+            exporter(event)
+
+    def request(self, method, path, status, seconds, bytes_sent,
+                bytes_received, error=None):
+        """Record one API request."""
+        name = self._endpoints.get(path)
+        if name is None:
+            name = self._endpoints[path] = endpoint(path)
+        key = (method, name)
+
+        with self._lock:
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(self.buckets)
+
+            histogram.observe(seconds)
+            self.requests[key + (status,)] += 1
+            self.bytes_sent[key] += bytes_sent
+            self.bytes_received[key] += bytes_received
+
+        if self.exporters:
+            self._export(dict(
+                kind="request",
+                method=method,
+                path=path,
+                endpoint=key[1],
+                status=status,
+                seconds=seconds,
+                bytes_sent=bytes_sent,
+                bytes_received=bytes_received,
+                error=error,
+            ))
+
+    def count(self, kind, **event):
+        """Count an event of "kind", e.g. a retry."""
+        with self._lock:
+            self.counters[kind] += 1
+
+        if self.exporters:
+            event["kind"] = kind
+            self._export(event)
+
+    def auth(self, kind, seconds, error=None):
+        """Record a token request, "auth" or "reauth"."""
+        self.count(kind, seconds=seconds, error=error)
+        if error is not None:
+            self.count("%s_failed" % kind, error=error)
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.requests.clear()
+            self.bytes_sent.clear()
+            self.bytes_received.clear()
+            self.counters.clear()
+
+
+def _labels(**labels):
+    return "{%s}" % ",".join(
+        '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in sorted(labels.items())
+    )
+
+
+def prometheus_text(tracer, prefix="wink"):
+    """The measurements of a Tracer in the Prometheus text format."""
+    with tracer._lock:
+        latency = [
+            (key, histogram.cumulative(), histogram.sum, histogram.count)
+            for key, histogram in sorted(tracer.latency.items())
+        ]
+        requests = sorted(tracer.requests.items(), key=str)
+        sent = sorted(tracer.bytes_sent.items())
+        received = sorted(tracer.bytes_received.items())
+        counters = sorted(tracer.counters.items())
+
+    lines = [
+        "# TYPE %s_request_seconds histogram" % prefix,
+    ]
+    for (method, path), buckets, total, count in latency:
+        for bound, cumulative in buckets:
+            lines.append("%s_request_seconds_bucket%s %d" % (
+                prefix,
+                _labels(method=method, endpoint=path, le=bound),
+                cumulative))
+        labels = _labels(method=method, endpoint=path)
+        lines.append("%s_request_seconds_sum%s %r" % (prefix, labels, total))
+        lines.append("%s_request_seconds_count%s %d" % (
+            prefix, labels, count))
+
+    lines.append("# TYPE %s_requests_total counter" % prefix)
+    for (method, path, status), count in requests:
+        lines.append("%s_requests_total%s %d" % (
+            prefix,
+            _labels(method=method, endpoint=path,
+                    status=status or "error"),
+            count))
+
+    for name, counter in [("sent", sent), ("received", received)]:
+        lines.append("# TYPE %s_bytes_%s_total counter" % (prefix, name))
+        for (method, path), count in counter:
+            lines.append("%s_bytes_%s_total%s %d" % (
+                prefix, name, _labels(method=method, endpoint=path), count))
+
+    lines.append("# TYPE %s_events_total counter" % prefix)
+    for kind, count in counters:
+        lines.append("%s_events_total%s %d" % (
+            prefix, _labels(kind=kind), count))
+
+    return "\n".join(lines) + "\n"
+
+
+class LoggingExporter(object):
+    """Exporter writing one log record per event."""
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger("wink")
+        self.level = level
+
+    def __call__(self, event):
+        if not self.logger.isEnabledFor(self.level):
+            return
+
+        if event["kind"] == "request":
+            self.logger.log(
+                self.level, "%s %s -> %s in %.1f ms (%d/%d bytes)%s",
+                event["method"], event["path"], event["status"],
+                event["seconds"] * 1e3, event["bytes_sent"],
+                event["bytes_received"],
+                ": %s" % event["error"] if event["error"] else "")
+        else:
+            self.logger.log(self.level, "%s %s", event["kind"], ", ".join(
+                "%s=%s" % (k, v) for k, v in sorted(event.items())
+                if k != "kind" and v is not None))
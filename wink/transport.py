@@ -0,0 +1,174 @@
+"""Transports carry the HTTP requests of the Wink class and of the auth
+functions to the Wink servers.
+
+A transport has a single method,
+
+    request(url, method, headers, body) -> (response, content)
+
+which behaves like httplib2.Http.request: "response" is a dict of the
+(lowercase) response headers plus "status", the status code as a
+string, and "content" is the response body as bytes.
+
+Transports may also implement
+
+    stream(url, method, headers, body) -> (response, chunks)
+
+where "chunks" is an iterable of bytes that reads the body as it
+arrives, for large responses (see the stream module). By default the
+whole body is read first, and is the only chunk. If "chunks" has a
+"close" method, it releases the connection of a body that is not read.
+
+Transports must be safe to use from many threads at once.
+"""
+
+import http.client
+import queue
+import threading
+import urllib.parse
+
+import httplib2
+
+
+class Transport(object):
+    """
+    Transport classes should implement this interface.
+    """
+
+    def request(self, url, method="GET", headers=None, body=None):
+        raise NotImplementedError
+
+    def stream(self, url, method="GET", headers=None, body=None):
+        resp, content = self.request(url, method, headers=headers,
+                                     body=body)
+        return resp, [content]
+
+    def close(self):
+        pass
+
+
+class _Chunks(object):
+    """The body of a streamed response, read in chunks. The connection is
+    closed once the body is read, or on "close", even if no chunk was
+    read (which a generator's finally would miss).
+    """
+
+    def __init__(self, connection, response, chunk_size):
+        self.connection = connection
+        self.response = response
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.connection is None:
+            raise StopIteration
+
+        try:
+            chunk = self.response.read(self.chunk_size)
+        except:
+            self.close()
+            raise
+
+        if not chunk:
+            self.close()
+            raise StopIteration
+
+        return chunk
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class HttpPool(Transport):
+    """Pool of keep-alive httplib2.Http connections.
+
+    httplib2.Http objects are not thread safe, so each request borrows an
+    idle one from the pool and returns it afterwards. At most "size"
+    requests are sent at once; further callers wait for a free
+    connection.
+
+    httplib2 always reads whole responses, so "stream" sends its request
+    on a new http.client connection instead, which is closed once its
+    body is read, in chunks of "chunk_size" bytes.
+    """
+
+    def __init__(self, size=8, timeout=None, chunk_size=65536):
+        self.size = size
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+        self._slots = threading.BoundedSemaphore(size)
+        # most recently used first, to reuse warm connections
+        self._idle = queue.LifoQueue()
+
+    def request(self, url, method="GET", headers=None, body=None):
+        with self._slots:
+            try:
+                http = self._idle.get_nowait()
+            except queue.Empty:
+                http = httplib2.Http(timeout=self.timeout)
+
+            try:
+                return http.request(url, method, headers=headers, body=body)
+            finally:
+                self._idle.put(http)
+
+    def stream(self, url, method="GET", headers=None, body=None):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme == "https":
+            connection = http.client.HTTPSConnection(
+                parts.netloc, timeout=self.timeout)
+        else:
+            connection = http.client.HTTPConnection(
+                parts.netloc, timeout=self.timeout)
+
+        path = parts.path or "/"
+        if parts.query:
+            path = "%s?%s" % (path, parts.query)
+
+        # the slot is only held until the response starts, as reading
+        # the body takes no connection from the pool
+        with self._slots:
+            try:
+                connection.request(method, path, body=body,
+                                   headers=headers or {})
+                response = connection.getresponse()
+            except:
+                connection.close()
+                raise
+
+        resp = dict((k.lower(), v) for k, v in response.getheaders())
+        resp["status"] = str(response.status)
+
+        return resp, _Chunks(connection, response, self.chunk_size)
+
+    def close(self):
+        while True:
+            try:
+                http = self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+            if hasattr(http, "close"):
+                http.close()
+
+
+class SharedTransport(Transport):
+    """A transport used by several clients, e.g. the accounts of a
+    pool.WinkPool. Closing it does not close the wrapped transport,
+    which is left to its owner.
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def request(self, url, method="GET", headers=None, body=None):
+        return self.transport.request(url, method, headers=headers,
+                                      body=body)
+
+    def stream(self, url, method="GET", headers=None, body=None):
+        return self.transport.stream(url, method, headers=headers,
+                                     body=body)
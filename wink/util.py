@@ -5,7 +5,7 @@ as opposed to external scripts.
 
 from .api import Wink
 from .auth import auth
-from .persist import ConfigFile
+from .persist import ConfigFile, SnapshotFile
 
 
 def login(base_url="https://winkapi.quirky.com", config_file=None,
@@ -45,12 +45,19 @@ def login(base_url="https://winkapi.quirky.com", config_file=None,
             cf.save(auth_result)
 
 
-def init(config_file="config.cfg", debug=False):
+def init(config_file="config.cfg", debug=False, snapshot_file=None):
     """
     Load authentication information from the specified configuration file,
     and init the Wink object.
+
+    If a snapshot file is given, the devices are loaded from it and
+    revalidated in the background (see persist.SnapshotFile).
     """
 
     cf = ConfigFile(config_file)
 
-    return Wink(cf, debug=debug)
+    snapshot = None
+    if snapshot_file:
+        snapshot = SnapshotFile(snapshot_file)
+
+    return Wink(cf, debug=debug, snapshot=snapshot)